@@ -0,0 +1,52 @@
+"""
+Times the external sort engine serially and with hash-partitioned worker
+pools of increasing size on synthetic lists larger than one run.
+
+    python benchmarks/bench_parallel.py [n_items] [max_workers]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from listcompare.external import ExternalComparison, default_workers  # noqa: E402
+
+
+RUN_SIZE = 250_000
+
+
+def make_pairs(n: int, seed: int):
+    rng = random.Random(seed)
+    items = [f"Item-{rng.randrange(2 * n)}" for _ in range(n)]
+    return [(item.casefold(), item) for item in items]
+
+
+def measure(pairs_a, pairs_b, workers: int):
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        comparison = ExternalComparison(pairs_a, pairs_b, out_dir, RUN_SIZE, workers)
+        return time.perf_counter() - start, comparison.counts
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else default_workers()
+    pairs_a = make_pairs(n, 1)
+    pairs_b = make_pairs(n, 2)
+    print(f"{n:,} x {n:,} items, run size {RUN_SIZE:,}, {default_workers()} CPUs")
+
+    baseline, serial = measure(pairs_a, pairs_b, 1)
+    print(f"   1 worker:  {baseline:6.2f} s")
+    workers = 2
+    while workers <= max(2, max_workers):
+        elapsed, counts = measure(pairs_a, pairs_b, workers)
+        assert counts == serial
+        print(f"  {workers:>2} workers: {elapsed:6.2f} s  speedup {baseline / elapsed:4.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
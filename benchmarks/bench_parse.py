@@ -0,0 +1,62 @@
+"""
+Compares the legacy parse_list + build_norm_map path with the fused
+parse_norm_map pass on a synthetic list, both on the pure-Python path
+(see bench_vectorized.py for the Arrow kernels).
+
+    python benchmarks/bench_parse.py [n_items]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from listcompare import build_norm_map, parse_list, parse_norm_map  # noqa: E402
+
+
+def make_text(n: int) -> str:
+    rng = random.Random(0)
+    return "\n".join(f"  Item-{rng.randrange(n // 2)}  " for _ in range(n))
+
+
+def legacy(text: str):
+    items, _ = parse_list(text, "newline", "", False, True, vectorize=False)
+    return build_norm_map(items, False)
+
+
+def fused(text: str):
+    return parse_norm_map(text, "newline", "", False, True, vectorize=False)
+
+
+def measure(fn, text: str):
+    # Timed without tracing; tracemalloc slows allocation-heavy code a lot.
+    start = time.perf_counter()
+    result = fn(text)
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    text = make_text(n)
+    print(f"{n:,} items, {len(text) / 1e6:.1f} MB of text")
+
+    results = {}
+    for fn in (legacy, fused):
+        mapping, elapsed, peak = measure(fn, text)
+        results[fn.__name__] = mapping
+        print(f"{fn.__name__:>8}: {elapsed:6.2f} s  peak {peak / 1e6:8.1f} MB  ({len(mapping):,} distinct)")
+
+    assert results["legacy"] == results["fused"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares the pure-Python split/strip/casefold/dedupe path with the Arrow
+string-kernel path of parse_norm_map on a synthetic ASCII list.
+
+    python benchmarks/bench_vectorized.py [n_items]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from listcompare import parse_norm_map  # noqa: E402
+from listcompare.columnar import pyarrow_available  # noqa: E402
+
+CASES = (
+    # (delim_mode, case_sensitive, strip_items, distinct fraction)
+    ("newline", False, True, 0.5),
+    ("newline", False, True, 0.01),
+    ("newline", True, True, 0.5),
+    ("comma", False, False, 0.5),
+    ("whitespace", False, True, 0.5),
+)
+
+
+def make_text(n: int, distinct: float, delim_mode: str) -> str:
+    rng = random.Random(0)
+    sep = {"newline": "\n", "comma": ",", "whitespace": " "}[delim_mode]
+    pad = "  " if delim_mode != "whitespace" else ""
+    return sep.join(f"{pad}Item-{rng.randrange(max(1, int(n * distinct)))}{pad}" for _ in range(n))
+
+
+def python_path(text, delim_mode, case_sensitive, strip_items):
+    return parse_norm_map(text, delim_mode, "", case_sensitive, strip_items, vectorize=False)
+
+
+def arrow_path(text, delim_mode, case_sensitive, strip_items):
+    return parse_norm_map(text, delim_mode, "", case_sensitive, strip_items)
+
+
+def best_of(fn, *args, repeat: int = 3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    if not pyarrow_available():
+        sys.exit("pyarrow is not installed")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{n:,} items")
+    for delim_mode, case_sensitive, strip_items, distinct in CASES:
+        text = make_text(n, distinct, delim_mode)
+        args = (text, delim_mode, case_sensitive, strip_items)
+        expected, python_s = best_of(python_path, *args)
+        result, arrow_s = best_of(arrow_path, *args)
+        assert list(result.items()) == list(expected.items())
+        print(
+            f"{delim_mode:>10} case={case_sensitive!s:<5} strip={strip_items!s:<5} "
+            f"distinct={distinct:<4}: python {python_s:5.2f} s  arrow {arrow_s:5.2f} s  "
+            f"({python_s / arrow_s:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
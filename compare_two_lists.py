@@ -1,9 +1,47 @@
 import io
-from typing import List, Set, Tuple
+import math
+import os
+from typing import Dict, Iterator, Optional, Tuple
 
 import pandas as pd
 import streamlit as st
 
+from listcompare import (
+    ExternalComparison,
+    ListComparison,
+    iter_file_pairs,
+    norm_map_from_file,
+    parse_norm_map,
+)
+from listcompare.bloom import DEFAULT_ERROR_RATE, BloomComparison, BloomFilter
+from listcompare.columnar import pyarrow_available
+from listcompare.editdistance import DEFAULT_MAX_DISTANCE, EditDistanceComparison
+from listcompare.export import available_compressions, available_formats
+from listcompare.external import default_workers
+from listcompare.fuzzy import DEFAULT_FUZZY_THRESHOLD, FuzzyComparison
+from listcompare.index import IndexComparison, ReferenceIndex, write_index
+from listcompare.normalize import Pipeline
+from listcompare.records import RecordComparison, record_maps_from_table
+from listcompare.sketches import (
+    DEFAULT_MINHASH_K,
+    EstimatedComparison,
+    HyperLogLog,
+    MinHash,
+    jaccard_error_bound,
+)
+from listcompare.tabular import iter_table_pairs, norm_map_from_table, read_header
+from ui_helpers import (
+    FILE_NAME_HELP,
+    input_errors,
+    make_download,
+    named_file,
+    normalization_settings,
+    resolve_in,
+    server_dir,
+    text_digest,
+    upload_digest,
+)
+
 
 # -----------------------------
 # Callbacks for Clearing State
@@ -20,66 +58,303 @@ def clear_all():
 
 
 # -----------------------------
-# Utilities
+# Cached Processing
 # -----------------------------
-def parse_list(
-    text: str,
+# Every widget interaction reruns the script. Parsed lists and set results
+# are kept in a bounded resource cache keyed on a digest of the text plus the
+# parsing options, so unchanged inputs are not re-parsed. Underscore-prefixed
+# arguments are not hashed by Streamlit.
+CACHE_MAX_ENTRIES = 4
+CACHE_TTL = "1h"
+PAGE_SIZES = [100, 1_000, 10_000]
+TABLE_FORMAT_NAMES = {"CSV": "csv", "TSV": "tsv", "Parquet": "parquet", "Arrow IPC": "arrow"}
+COMPRESSED_UPLOAD_HELP = (
+    "gzip, bz2, xz and zstd files are decompressed on the fly. Streamlit keeps "
+    "each upload in server memory; use Server files for inputs near RAM size."
+)
+SERVER_FILE_HELP = (
+    "Path inside the server's data directory (LISTCOMPARE_DATA_DIR); the file "
+    "is read from disk in chunks."
+)
+DATA_DIR = server_dir("data")
+INDEX_DIR = server_dir("index")
+BLOOM_DIR = server_dir("bloom")
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_norm_map(
+    digest: str,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    pipeline: Pipeline,
+    _text: str,
+) -> Dict[str, str]:
+    return parse_norm_map(_text, delim_mode, custom_delim, case_sensitive, strip_items, pipeline)
+
+
+class ServerFile(io.BufferedReader):
+    """
+    A file on the server's disk, opened with the same file_id and size
+    attributes as an upload so every upload code path can read it.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(io.FileIO(path, "rb"))
+        stat = os.stat(path)
+        self.file_id = f"{path}:{stat.st_mtime_ns}"
+        self.size = stat.st_size
+
+
+def open_server_file(path: str, label: str) -> Optional[ServerFile]:
+    # Only files inside the data directory are readable, however the path is written.
+    if not path:
+        return None
+    resolved = resolve_in(DATA_DIR, path)
+    if resolved is None:
+        st.error(f"{label}: only files inside the server's data directory can be read.")
+        st.stop()
+    if not os.path.isfile(resolved):
+        st.error(f"{label}: no such file in the server's data directory: {path}")
+        st.stop()
+    return ServerFile(resolved)
+
+
+def upload_pairs(uploaded, options: Tuple, table: Optional[Tuple]) -> Iterator[Tuple[str, str]]:
+    """
+    Streams (normalized, original) pairs of an upload, read as a plain list
+    or, given a table spec (format, key columns, has header), by key column.
+    """
+    delim_mode, custom_delim, case_sensitive, strip_items, pipeline = options
+    uploaded.seek(0)
+    if table is None:
+        return iter_file_pairs(
+            uploaded, delim_mode, custom_delim, case_sensitive, strip_items, pipeline=pipeline
+        )
+    fmt, key_columns, has_header = table
+    return iter_table_pairs(
+        uploaded, fmt, key_columns, case_sensitive, strip_items, has_header, pipeline
+    )
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_upload_norm_map(
+    digest: str,
     delim_mode: str,
     custom_delim: str,
     case_sensitive: bool,
     strip_items: bool,
-) -> Tuple[List[str], Set[str]]:
+    pipeline: Pipeline,
+    table: Optional[Tuple],
+    _uploaded,
+) -> Dict[str, str]:
+    # Streams the upload through the tokenizer; the decoded text is never held whole.
+    _uploaded.seek(0)
+    if table is None:
+        return norm_map_from_file(
+            _uploaded, delim_mode, custom_delim, case_sensitive, strip_items, pipeline=pipeline
+        )
+    fmt, key_columns, has_header = table
+    return norm_map_from_table(
+        _uploaded, fmt, key_columns, case_sensitive, strip_items, has_header, pipeline
+    )
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_minhash(digest: str, options: Tuple, table: Optional[Tuple], k: int, _uploaded) -> MinHash:
+    if _uploaded is None:
+        return MinHash(k)
+    return MinHash.from_keys((norm for norm, _ in upload_pairs(_uploaded, options, table)), k)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_hll(digest: str, options: Tuple, table: Optional[Tuple], _uploaded) -> HyperLogLog:
+    if _uploaded is None:
+        return HyperLogLog()
+    return HyperLogLog.from_keys(norm for norm, _ in upload_pairs(_uploaded, options, table))
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_bloom(
+    digest: str,
+    options: Tuple,
+    table: Optional[Tuple],
+    capacity: int,
+    error_rate: float,
+    path: str,
+    path_mtime: float,
+    _uploaded,
+) -> BloomFilter:
+    # A saved filter is reused when it was built from this A with these
+    # options, or when there is no A to rebuild it from; otherwise it is
+    # rebuilt from A and saved over the old one.
+    meta = bloom_options(options, table)
+    if path and os.path.exists(path):
+        saved = BloomFilter.load(path)
+        if _uploaded is None or (saved.options, saved.source) == (meta, digest):
+            return saved
+    bloom = BloomFilter(capacity, error_rate, meta, digest)
+    if _uploaded is not None:
+        bloom.update(norm for norm, _ in upload_pairs(_uploaded, options, table))
+    if path:
+        bloom.save(path)
+    return bloom
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_bloom_comparison(
+    key: Tuple, table_a: Optional[Tuple], _bloom: BloomFilter, _norm_map_b: Dict[str, str], _upload_a
+) -> BloomComparison:
+    pairs_a = None
+    if _upload_a is not None:
+        pairs_a = upload_pairs(_upload_a, key[2], table_a)
+    return BloomComparison(_bloom, _norm_map_b, pairs_a)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_reference_index(path: str, path_mtime: float) -> ReferenceIndex:
+    return ReferenceIndex(path)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_index_comparison(
+    key: Tuple, _index: ReferenceIndex, _norm_map_b: Dict[str, str]
+) -> IndexComparison:
+    return IndexComparison(_index, _norm_map_b)
+
+
+def request_exact(sketch_key: Tuple):
+    st.session_state.exact_for = sketch_key
+
+
+def load_norm_map(
+    text: str, uploaded, options: Tuple, table: Optional[Tuple] = None
+) -> Tuple[str, Dict[str, str]]:
     """
-    Parses the raw text into a cleaned list and a normalized set.
+    Returns (cache digest, norm map) for an uploaded file, or for the text if no file is given.
     """
-    text = text or ""
-
-    if delim_mode == "newline":
-        parts = text.splitlines()
-    elif delim_mode == "comma":
-        parts = text.split(",")
-    elif delim_mode == "semicolon":
-        parts = text.split(";")
-    elif delim_mode == "whitespace":
-        parts = text.split()
-    elif delim_mode == "custom":
-        parts = text.split(custom_delim) if custom_delim else [text]
-    else:  # auto
-        parts = text.splitlines()
-        if len(parts) <= 1:
-            parts = text.split(",")
-
-    cleaned = []
-    for p in parts:
-        item = p.strip() if strip_items else p
-        if item:
-            cleaned.append(item)
-
-    norm = cleaned if case_sensitive else [c.casefold() for c in cleaned]
-    return cleaned, set(norm)
-
-
-def build_norm_map(original_list: List[str], case_sensitive: bool):
+    if uploaded is not None:
+        digest = upload_digest(uploaded, table)
+        return digest, cached_upload_norm_map(digest, *options, table, _uploaded=uploaded)
+    digest = text_digest(text)
+    return digest, cached_norm_map(digest, *options, _text=text)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_comparison(key: Tuple, _norm_map_a: Dict[str, str], _norm_map_b: Dict[str, str]):
+    return ListComparison(_norm_map_a, _norm_map_b)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_upload_records(
+    digest: str, options: Tuple, table: Tuple, payload_columns: Tuple, _uploaded
+) -> Tuple[Dict, Dict]:
+    _uploaded.seek(0)
+    fmt, key_columns, has_header = table
+    _, _, case_sensitive, strip_items, pipeline = options
+    return record_maps_from_table(
+        _uploaded, fmt, key_columns, case_sensitive, strip_items, has_header, payload_columns, pipeline
+    )
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_record_comparison(
+    key: Tuple, _maps_a: Tuple[Dict, Dict], _maps_b: Tuple[Dict, Dict]
+) -> RecordComparison:
+    return RecordComparison(_maps_a[0], _maps_b[0], _maps_a[1], _maps_b[1])
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_fuzzy_comparison(
+    key: Tuple, method: str, threshold: float, max_distance: int, _base: ListComparison
+) -> FuzzyComparison:
+    if method == "Edit distance":
+        return EditDistanceComparison(_base, max_distance)
+    return FuzzyComparison(_base, threshold)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_external_comparison(
+    key: Tuple, table_a: Optional[Tuple], table_b: Optional[Tuple], _upload_a, _upload_b
+) -> ExternalComparison:
+    # Region files live in a temporary directory removed when the entry is
+    # evicted. The worker count is part of the key: it changes the order of
+    # unsorted regions.
+    pairs = [
+        upload_pairs(u if u is not None else io.BytesIO(), key[2], table)
+        for u, table in ((_upload_a, table_a), (_upload_b, table_b))
+    ]
+    return ExternalComparison(*pairs, workers=key[3])
+
+
+# -----------------------------
+# Utilities
+# -----------------------------
+def options_meta(options: Tuple) -> Dict:
+    meta = dict(zip(("delim_mode", "custom_delim", "case_sensitive", "strip_items"), options))
+    # Only recorded when set, so indexes saved before pipelines still match.
+    if options[4]:
+        meta["pipeline"] = [list(stage) for stage in options[4]]
+    return meta
+
+
+def bloom_options(options: Tuple, table: Optional[Tuple]) -> Dict:
+    meta = options_meta(options)
+    if table:
+        fmt, key_columns, has_header = table
+        meta["table"] = [fmt, list(key_columns), has_header]
+    return meta
+
+
+def key_column_picker(uploaded, label: str, fmt: str, has_header: bool) -> Optional[Tuple]:
     """
-    Builds a mapping from normalized value -> first-seen original value.
+    Lets the user pick the key column(s) of an uploaded table and returns
+    its table spec, or None if there is nothing to pick from.
     """
-    norm_list = original_list if case_sensitive else [x.casefold() for x in original_list]
-    mapping = {}
-    for raw, norm in zip(original_list, norm_list):
-        mapping.setdefault(norm, raw)
-    return mapping
-
-
-def make_download(name: str, items: List[str]):
-    buf = io.StringIO()
-    buf.write("\n".join(items))
-    st.download_button(
-        label=f"Download {name} (TXT)",
-        data=buf.getvalue(),
-        file_name=f"{name}.txt",
-        mime="text/plain",
-        use_container_width=True
+    if uploaded is None:
+        return None
+    uploaded.seek(0)
+    with input_errors():
+        columns = read_header(uploaded, fmt, has_header)
+    if not columns:
+        return None
+    picked = st.multiselect(
+        f"{label} key column(s)",
+        range(len(columns)),
+        default=[0],
+        format_func=lambda i: columns[i] or f"Column {i + 1}",
+        key=f"columns_{uploaded.file_id}",
+        help="Rows are compared by these columns; several make a composite key.",
     )
+    if not picked:
+        st.warning(f"Pick at least one key column for {label}.")
+        st.stop()
+    return fmt, tuple(picked), has_header
+
+
+def shared_payload_columns(upload_a, table_a: Tuple, upload_b, table_b: Tuple) -> Tuple[Tuple, Tuple]:
+    """
+    Positions in each table of the non-key columns both share by name, in
+    A's column order.
+    """
+    positions = []
+    for uploaded, (fmt, key_columns, has_header) in ((upload_a, table_a), (upload_b, table_b)):
+        uploaded.seek(0)
+        with input_errors():
+            header = read_header(uploaded, fmt, has_header)
+        by_name = {}
+        for i, name in enumerate(header):
+            if i not in key_columns:
+                by_name.setdefault(name, i)
+        positions.append(by_name)
+    pos_a, pos_b = positions
+    shared = [name for name in pos_a if name in pos_b]
+    return tuple(pos_a[n] for n in shared), tuple(pos_b[n] for n in shared)
+
+
+def metric_value(count: int, approximate: bool):
+    return f"≈ {count:,}" if approximate else count
 
 
 # -----------------------------
@@ -111,18 +386,163 @@ with st.sidebar:
 
     st.divider()
 
+    input_source = st.radio(
+        "Input source",
+        ["Paste text", "Upload files"] + (["Server files"] if DATA_DIR else []),
+        horizontal=True,
+        help="Uploads are held in server memory by Streamlit. Server files are "
+             "read from disk, so the external sort engine can compare lists "
+             "larger than RAM; they are offered when LISTCOMPARE_DATA_DIR is set.",
+    )
+    from_files = input_source != "Paste text"
+    engine = "In-memory sets"
+    if from_files:
+        engine = st.selectbox(
+            "Comparison engine",
+            [
+                "In-memory sets",
+                "External sort (disk)",
+                "Estimate (HyperLogLog)",
+                "Bloom prefilter (large A, small B)",
+            ],
+            help="External sort spills sorted runs to disk and merge-joins them, "
+                 "for lists larger than memory. Estimate fills the summary from "
+                 "fixed-size sketches without listing items. Bloom prefilter keeps "
+                 "only a bit array for A and checks B against it.",
+        )
+    file_format = "Text list"
+    detect_changes = False
+    if from_files:
+        file_format = st.radio(
+            "File format",
+            ["Text list", "CSV", "TSV"] + (["Parquet", "Arrow IPC"] if pyarrow_available() else []),
+            horizontal=True,
+            help="Tables are read by column; pick the key column(s) under each "
+                 "upload. Parquet and Arrow files load only those columns.",
+        )
+        has_header = st.checkbox(
+            "First row is a header", True, disabled=file_format not in ("CSV", "TSV")
+        )
+        detect_changes = st.checkbox(
+            "Detect changed rows",
+            False,
+            disabled=file_format == "Text list" or engine != "In-memory sets",
+            help="List matched keys whose other columns differ. Columns are "
+                 "matched by name, and every column is read.",
+        )
+    workers = 1
+    if engine == "External sort (disk)":
+        workers = st.number_input(
+            "Worker processes",
+            min_value=1,
+            max_value=default_workers(),
+            value=1,
+            help="Splits both lists by hash of the key and sorts and joins the "
+                 "parts in parallel processes. Worth it for large lists on a "
+                 "server with idle cores.",
+        )
+    if engine == "Bloom prefilter (large A, small B)":
+        bloom_capacity = st.number_input(
+            "Expected distinct items in A", min_value=1, value=10_000_000, step=1_000_000
+        )
+        bloom_error_rate = st.select_slider(
+            "False positive rate", [0.001, 0.005, 0.01, 0.05], DEFAULT_ERROR_RATE
+        )
+        bloom_path = ""
+        if BLOOM_DIR:
+            bloom_name = st.text_input(
+                "Bloom filter name (optional)",
+                help="Saved as <name>.bloom in the server's Bloom filter directory. "
+                     "An existing filter is loaded instead of rebuilding it from A "
+                     "when A is not given or is the same file with the same options; "
+                     "otherwise the new filter is saved there.",
+            )
+            if bloom_name:
+                bloom_path = named_file(BLOOM_DIR, bloom_name, ".bloom") or ""
+                if not bloom_path:
+                    st.error(f"Invalid Bloom filter name. {FILE_NAME_HELP}")
+        else:
+            st.caption("Set LISTCOMPARE_BLOOM_DIR to save Bloom filters on the server.")
+
     delim_mode = st.selectbox(
         "Delimiter",
-        ["auto", "newline", "comma", "semicolon", "whitespace", "custom"]
+        ["auto", "newline", "comma", "semicolon", "whitespace", "custom"],
+        disabled=file_format != "Text list",
     )
 
     custom_delim = st.text_input("Custom delimiter") if delim_mode == "custom" else ""
 
     case_sensitive = st.checkbox("Case sensitive comparison", False)
     strip_items = st.checkbox("Trim whitespace", True)
-    deduplicate = st.checkbox("Deduplicate results", True)
+
+    pipeline = normalization_settings()
+
     sort_results = st.checkbox("Sort output alphabetically", False)
 
+    fuzzy_matching = st.checkbox(
+        "Fuzzy matching",
+        False,
+        disabled=engine != "In-memory sets",
+        help="Pair items found in only one list with their closest counterpart "
+             "in the other.",
+    )
+    fuzzy_method = st.radio(
+        "Fuzzy method",
+        ["Trigram similarity", "Edit distance"],
+        horizontal=True,
+        disabled=not fuzzy_matching,
+        help="Trigram similarity suits names and free text; edit distance "
+             "suits short codes such as SKUs and IDs.",
+    )
+    fuzzy_threshold = DEFAULT_FUZZY_THRESHOLD
+    fuzzy_max_distance = DEFAULT_MAX_DISTANCE
+    if fuzzy_method == "Edit distance":
+        fuzzy_max_distance = st.number_input(
+            "Maximum edit distance", min_value=1, max_value=5, value=DEFAULT_MAX_DISTANCE,
+            disabled=not fuzzy_matching,
+        )
+    else:
+        fuzzy_threshold = st.slider(
+            "Fuzzy similarity threshold", 0.3, 1.0, DEFAULT_FUZZY_THRESHOLD, 0.05,
+            disabled=not fuzzy_matching,
+        )
+
+    with st.expander("Reference index"):
+        index_path = ""
+        if INDEX_DIR:
+            index_name = st.text_input(
+                f"Index name for {label_a}",
+                help="Saved as <name>.idx in the server's index directory. Save "
+                     "List A's parsed items once, then compare new lists against "
+                     "it without re-parsing A.",
+            )
+            if index_name:
+                index_path = named_file(INDEX_DIR, index_name, ".idx") or ""
+                if not index_path:
+                    st.error(f"Invalid index name. {FILE_NAME_HELP}")
+        else:
+            st.caption("Set LISTCOMPARE_INDEX_DIR to save reference indexes on the server.")
+        save_index = st.button(
+            f"Save {label_a} as index", disabled=not index_path, use_container_width=True
+        )
+        use_index = st.checkbox(
+            f"Use saved index as {label_a}",
+            disabled=not (index_path and os.path.exists(index_path)),
+        )
+
+    with st.expander("Performance"):
+        minhash_preview = st.checkbox(
+            "Similarity preview (MinHash)",
+            False,
+            disabled=not from_files,
+            help="For files: estimate Jaccard similarity in one streaming pass "
+                 "before building the full comparison.",
+        )
+        minhash_k = st.select_slider(
+            "MinHash size (k)", [64, 128, 256, 512, 1024], DEFAULT_MINHASH_K,
+            disabled=not minhash_preview,
+        )
+
     st.divider()
     
     # Clear both button using callback
@@ -135,60 +555,180 @@ with st.sidebar:
 st.markdown("### 📥 Input Your Lists")
 
 colA, colB = st.columns(2)
-
-with colA:
-    # Key links the widget directly to st.session_state.text_a
-    st.text_area(
-        label=f"{label_a} items",
-        key="text_a",
-        height=250,
-        placeholder="Paste items here...",
-    )
-    st.button(f"Clear {label_a}", on_click=clear_a, use_container_width=True)
-
-with colB:
-    st.text_area(
-        label=f"{label_b} items",
-        key="text_b",
-        height=250,
-        placeholder="Paste items here...",
-    )
-    st.button(f"Clear {label_b}", on_click=clear_b, use_container_width=True)
+upload_a = upload_b = None
+table_a = table_b = None
+
+if from_files:
+    table_format = TABLE_FORMAT_NAMES.get(file_format)
+    with colA:
+        if input_source == "Server files":
+            upload_a = open_server_file(
+                st.text_input(f"{label_a} file path", key="path_a", help=SERVER_FILE_HELP), label_a
+            )
+        else:
+            upload_a = st.file_uploader(
+                f"{label_a} file", key="upload_a", help=COMPRESSED_UPLOAD_HELP
+            )
+        if table_format:
+            table_a = key_column_picker(upload_a, label_a, table_format, has_header)
+    with colB:
+        if input_source == "Server files":
+            upload_b = open_server_file(
+                st.text_input(f"{label_b} file path", key="path_b", help=SERVER_FILE_HELP), label_b
+            )
+        else:
+            upload_b = st.file_uploader(
+                f"{label_b} file", key="upload_b", help=COMPRESSED_UPLOAD_HELP
+            )
+        if table_format:
+            table_b = key_column_picker(upload_b, label_b, table_format, has_header)
+
+    key_counts = {len(table[1]) if table else 1 for table in (table_a, table_b)}
+    if len(key_counts) > 1 and max(key_counts) > 1:
+        # Composite keys are digests and never equal a single-column key.
+        st.error("Pick the same number of key columns for both lists.")
+        st.stop()
+else:
+    with colA:
+        # Key links the widget directly to st.session_state.text_a
+        st.text_area(
+            label=f"{label_a} items",
+            key="text_a",
+            height=250,
+            placeholder="Paste items here...",
+        )
+        st.button(f"Clear {label_a}", on_click=clear_a, use_container_width=True)
+
+    with colB:
+        st.text_area(
+            label=f"{label_b} items",
+            key="text_b",
+            height=250,
+            placeholder="Paste items here...",
+        )
+        st.button(f"Clear {label_b}", on_click=clear_b, use_container_width=True)
 
 
 # -----------------------------
 # Processing logic
 # -----------------------------
-# We pull values directly from session state
-listA_raw, setA_norm = parse_list(
-    st.session_state.text_a, delim_mode, custom_delim, case_sensitive, strip_items
-)
-
-listB_raw, setB_norm = parse_list(
-    st.session_state.text_b, delim_mode, custom_delim, case_sensitive, strip_items
-)
-
-norm_map_A = build_norm_map(listA_raw, case_sensitive)
-norm_map_B = build_norm_map(listB_raw, case_sensitive)
+options = (delim_mode, custom_delim, case_sensitive, strip_items, pipeline)
+
+if minhash_preview and from_files:
+    # Only k bins per list are held, so this is ready long before the exact
+    # comparison; the exact sets are built only when asked for.
+    with st.spinner("Sketching lists..."), input_errors():
+        sketch_a = cached_minhash(
+            upload_digest(upload_a, table_a), options, table_a, minhash_k, _uploaded=upload_a
+        )
+        sketch_b = cached_minhash(
+            upload_digest(upload_b, table_b), options, table_b, minhash_k, _uploaded=upload_b
+        )
+    estimate = sketch_a.jaccard(sketch_b)
 
-# Set Operations
-inter_norm = setA_norm & setB_norm
-A_only_norm = setA_norm - setB_norm
-B_only_norm = setB_norm - setA_norm
+    st.divider()
+    st.markdown("### ⚡ Similarity Preview")
+    st.info(
+        f"**Jaccard Similarity (MinHash estimate, k={minhash_k}):** "
+        f"≈ {estimate:.1%} ± {jaccard_error_bound(estimate, minhash_k):.1%}"
+    )
 
-A_only = [norm_map_A[n] for n in A_only_norm]
-B_only = [norm_map_B[n] for n in B_only_norm]
-intersect = [norm_map_A[n] for n in inter_norm]
+    sketch_key = (upload_digest(upload_a, table_a), upload_digest(upload_b, table_b), options)
+    if st.session_state.get("exact_for") != sketch_key:
+        st.button(
+            "Compute exact comparison",
+            on_click=request_exact,
+            args=(sketch_key,),
+            use_container_width=True,
+        )
+        st.stop()
 
-if deduplicate:
-    A_only = list(dict.fromkeys(A_only))
-    B_only = list(dict.fromkeys(B_only))
-    intersect = list(dict.fromkeys(intersect))
+if engine == "Estimate (HyperLogLog)":
+    with st.spinner("Sketching lists..."), input_errors():
+        comparison = EstimatedComparison(
+            cached_hll(upload_digest(upload_a, table_a), options, table_a, _uploaded=upload_a),
+            cached_hll(upload_digest(upload_b, table_b), options, table_b, _uploaded=upload_b),
+        )
+elif engine == "Bloom prefilter (large A, small B)":
+    bloom_mtime = os.path.getmtime(bloom_path) if bloom_path and os.path.exists(bloom_path) else 0.0
+    with st.spinner("Building Bloom filter over A..."), input_errors():
+        bloom = cached_bloom(
+            upload_digest(upload_a, table_a), options, table_a, bloom_capacity, bloom_error_rate,
+            bloom_path, bloom_mtime, _uploaded=upload_a,
+        )
+    saved_options = dict(bloom.options)
+    if table_a is None:
+        # Without A there are no key columns to compare against.
+        saved_options.pop("table", None)
+    if saved_options != bloom_options(options, table_a):
+        st.warning(
+            f"The saved Bloom filter was built with different parsing options "
+            f"({bloom.options or 'not recorded'}); matches may be missed. Provide "
+            f"{label_a} to rebuild it."
+        )
+    with st.spinner("Checking B against the filter and verifying hits..."), input_errors():
+        digest_b, norm_map_b = load_norm_map("", upload_b, options, table_b)
+        key = (
+            upload_digest(upload_a, table_a), digest_b, options,
+            bloom_capacity, bloom_error_rate, bloom_path, bloom_mtime,
+        )
+        comparison = cached_bloom_comparison(key, table_a, bloom, norm_map_b, upload_a)
+elif engine == "External sort (disk)":
+    key = (upload_digest(upload_a, table_a), upload_digest(upload_b, table_b), options, workers)
+    with st.spinner("Sorting and merge-joining on disk..."), input_errors():
+        comparison = cached_external_comparison(key, table_a, table_b, upload_a, upload_b)
+elif use_index and index_path and os.path.exists(index_path):
+    index_mtime = os.path.getmtime(index_path)
+    index = cached_reference_index(index_path, index_mtime)
+    if index.options != options_meta(options):
+        st.warning(
+            f"The saved index was built with different parsing options "
+            f"({index.options}); results may not match."
+        )
 
-if sort_results:
-    A_only.sort()
-    B_only.sort()
-    intersect.sort()
+    with st.spinner("Parsing list and looking it up in the index..."), input_errors():
+        if from_files:
+            digest_b, norm_map_b = load_norm_map("", upload_b, options, table_b)
+        else:
+            digest_b, norm_map_b = load_norm_map(st.session_state.text_b, None, options)
+        key = (f"index:{index_path}:{index_mtime}", digest_b, options)
+        comparison = cached_index_comparison(key, index, norm_map_b)
+elif detect_changes and table_a and table_b:
+    payload_a, payload_b = shared_payload_columns(upload_a, table_a, upload_b, table_b)
+    if not payload_a:
+        st.warning("The lists share no non-key columns, so no rows can differ.")
+
+    with st.spinner("Parsing records..."), input_errors():
+        digest_a = upload_digest(upload_a, table_a)
+        digest_b = upload_digest(upload_b, table_b)
+        maps_a = cached_upload_records(digest_a, options, table_a, payload_a, _uploaded=upload_a)
+        maps_b = cached_upload_records(digest_b, options, table_b, payload_b, _uploaded=upload_b)
+
+    key = (digest_a, digest_b, options, payload_a, payload_b)
+    comparison = cached_record_comparison(key, maps_a, maps_b)
+else:
+    with st.spinner("Parsing lists..."), input_errors():
+        if from_files:
+            digest_a, norm_map_a = load_norm_map("", upload_a, options, table_a)
+            digest_b, norm_map_b = load_norm_map("", upload_b, options, table_b)
+        else:
+            # We pull values directly from session state
+            digest_a, norm_map_a = load_norm_map(st.session_state.text_a, None, options)
+            digest_b, norm_map_b = load_norm_map(st.session_state.text_b, None, options)
+
+    key = (digest_a, digest_b, options)
+    comparison = cached_comparison(key, norm_map_a, norm_map_b)
+
+    if save_index and index_path:
+        write_index(norm_map_a, index_path, options_meta(options))
+        st.toast(f"Saved {len(norm_map_a):,} items of {label_a} as index {index_name}")
+
+if fuzzy_matching and isinstance(comparison, ListComparison):
+    with st.spinner("Matching near-duplicates..."):
+        comparison = cached_fuzzy_comparison(
+            key, fuzzy_method, fuzzy_threshold, fuzzy_max_distance, comparison
+        )
+    key = (key, fuzzy_method, fuzzy_threshold, fuzzy_max_distance)
 
 
 # -----------------------------
@@ -197,20 +737,48 @@ if sort_results:
 st.divider()
 st.markdown("### 📊 Summary")
 
-m1, m2, m3 = st.columns(3)
-m1.metric(f"{label_a} only", len(A_only_norm))
-m2.metric("Common Items", len(inter_norm))
-m3.metric(f"{label_b} only", len(B_only_norm))
+counts = comparison.counts
+approximate_regions = getattr(comparison, "approximate_regions", ())
+approx = "≈ " if approximate_regions else ""
+
+extra_metrics = [
+    (name, title, help_text)
+    for name, title, help_text in (
+        ("changed", "Changed", "Common keys whose other columns differ"),
+        ("fuzzy", "Fuzzy matches", "One-sided items paired with a near-duplicate"),
+    )
+    if name in counts
+]
+metric_cols = st.columns(3 + len(extra_metrics))
+metric_cols[0].metric(f"{label_a} only", metric_value(counts["A_only"], "A_only" in approximate_regions))
+metric_cols[1].metric("Common Items", metric_value(counts["intersection"], "intersection" in approximate_regions))
+metric_cols[2].metric(f"{label_b} only", metric_value(counts["B_only"], "B_only" in approximate_regions))
+for col, (name, title, help_text) in zip(metric_cols[3:], extra_metrics):
+    col.metric(title, counts[name], help=help_text)
 
 # Similarity Scores
-union_norm = setA_norm | setB_norm
-jaccard = len(inter_norm) / len(union_norm) if union_norm else 0.0
-overlap_coeff = (
-    len(inter_norm) / min(len(setA_norm), len(setB_norm))
-    if min(len(setA_norm), len(setB_norm)) > 0 else 0.0
+jaccard = comparison.jaccard
+overlap_coeff = comparison.overlap
+
+st.info(
+    f"**Jaccard Similarity:** {approx}{jaccard:.1%} | "
+    f"**Overlap Coefficient:** {approx}{overlap_coeff:.3f}"
 )
 
-st.info(f"**Jaccard Similarity:** {jaccard:.1%} | **Overlap Coefficient:** {overlap_coeff:.3f}")
+if isinstance(comparison, EstimatedComparison):
+    st.caption(
+        f"Approximate: HyperLogLog estimates (±{comparison.sketch_a.relative_error:.1%} "
+        "per list); the common count is derived by inclusion–exclusion."
+    )
+    st.stop()
+
+if isinstance(comparison, BloomComparison):
+    st.caption(
+        f"Approximate: the {label_a} only count is derived from the Bloom filter."
+        + ("" if comparison.verified else
+           f" {label_a} was not available to verify hits, so common items may include "
+           "false positives.")
+    )
 
 
 # -----------------------------
@@ -218,34 +786,57 @@ st.info(f"**Jaccard Similarity:** {jaccard:.1%} | **Overlap Coefficient:** {over
 # -----------------------------
 st.markdown("### 🔍 Explorer")
 
+region_names = {f"{label_a} only": "A_only", "Intersection": "intersection", f"{label_b} only": "B_only"}
+if "changed" in counts:
+    region_names["Changed"] = "changed"
+if "fuzzy" in counts:
+    region_names["Fuzzy matches"] = "fuzzy"
+
 region = st.radio(
     "Choose data to view:",
-    (f"{label_a} only", "Intersection", f"{label_b} only"),
+    tuple(region_names),
     horizontal=True
 )
+region_key = region_names[region]
+
+total = counts[region_key]
+
+if region_key == "A_only" and isinstance(comparison, BloomComparison):
+    st.write(f"{label_a} only items are not kept in Bloom prefilter mode.")
+elif total:
+    # Only the visible page is converted to a DataFrame and sent to the browser.
+    p_col1, p_col2 = st.columns(2)
+    with p_col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+    num_pages = max(1, math.ceil(total / page_size))
+    with p_col2:
+        page_no = st.number_input(f"Page (of {num_pages:,})", min_value=1, max_value=num_pages, value=1)
+
+    start = (page_no - 1) * page_size
+    page_items = comparison.page(region_key, start, start + page_size, sort_results)
+    columns = comparison.region_columns(region_key)
+    page_df = (
+        pd.DataFrame(page_items, columns=list(columns)) if len(columns) > 1
+        else pd.DataFrame({columns[0]: page_items})
+    )
+    st.dataframe(page_df, use_container_width=True, hide_index=True)
+    st.caption(f"Rows {start + 1:,}–{start + len(page_items):,} of {total:,}")
+
+    compression = st.radio(
+        "Download compression",
+        available_compressions(),
+        horizontal=True,
+        help="TXT and CSV exports are compressed with streaming gzip/zstd; "
+             "Parquet and Arrow use their own encodings.",
+    )
 
-if region == f"{label_a} only":
-    selected_items = A_only
-elif region == "Intersection":
-    selected_items = intersect
-else:
-    selected_items = B_only
-
-if selected_items:
-    df = pd.DataFrame({"Item": selected_items})
-    st.dataframe(df, use_container_width=True, hide_index=True)
-
-    d_col1, d_col2 = st.columns(2)
-    with d_col1:
-        make_download(region.replace(" ", "_"), selected_items)
-    with d_col2:
-        csv_data = df.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            "Download CSV",
-            csv_data,
-            f"{region.replace(' ', '_')}.csv",
-            "text/csv",
-            use_container_width=True
-        )
+    formats = available_formats()
+    for d_col, fmt in zip(st.columns(len(formats)), formats):
+        with d_col:
+            name = region.replace(" ", "_")
+            make_download(
+                name, comparison, (engine, key), region_key, fmt, sort_results, compression,
+                label=name,
+            )
 else:
     st.write("No items found in this category.")
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Headless list comparison engine used by the Streamlit app.
+
+Importing this package does not pull in streamlit or pandas.
+"""
+from .bloom import BloomComparison, BloomFilter
+from .columnar import read_columns, write_column
+from .editdistance import BKTree, EditDistanceComparison, edit_distance_join, levenshtein
+from .engine import (
+    REGIONS,
+    ListComparison,
+    build_norm_map,
+    iter_norm_pairs,
+    jaccard_index,
+    norm_map_from_pairs,
+    normalize_items,
+    overlap_coefficient,
+    parse_list,
+    parse_norm_map,
+    split_items,
+)
+from .export import export_to_tempfile, iter_export_chunks, open_export, write_export
+from .external import ExternalComparison
+from .fuzzy import FuzzyComparison, TrigramIndex, fuzzy_join
+from .index import IndexComparison, ReferenceIndex, write_index
+from .lsh import similar_pairs, similarity_matrix
+from .multi import MultiComparison
+from .normalize import Pipeline
+from .records import RecordComparison, record_maps_from_table
+from .sketches import EstimatedComparison, HyperLogLog, MinHash, jaccard_error_bound
+from .streaming import (
+    iter_file_pairs,
+    iter_parts,
+    norm_map_from_chunks,
+    norm_map_from_file,
+    open_input,
+    read_chunks,
+)
+from .tabular import composite_key, iter_table_pairs, norm_map_from_table, read_header
+
+__all__ = [
+    "REGIONS",
+    "BKTree",
+    "BloomComparison",
+    "BloomFilter",
+    "EditDistanceComparison",
+    "EstimatedComparison",
+    "ExternalComparison",
+    "FuzzyComparison",
+    "HyperLogLog",
+    "IndexComparison",
+    "ListComparison",
+    "MinHash",
+    "MultiComparison",
+    "Pipeline",
+    "RecordComparison",
+    "ReferenceIndex",
+    "TrigramIndex",
+    "build_norm_map",
+    "composite_key",
+    "edit_distance_join",
+    "export_to_tempfile",
+    "fuzzy_join",
+    "iter_export_chunks",
+    "iter_file_pairs",
+    "iter_norm_pairs",
+    "iter_parts",
+    "iter_table_pairs",
+    "jaccard_error_bound",
+    "jaccard_index",
+    "levenshtein",
+    "norm_map_from_chunks",
+    "norm_map_from_file",
+    "norm_map_from_pairs",
+    "norm_map_from_table",
+    "normalize_items",
+    "open_export",
+    "open_input",
+    "overlap_coefficient",
+    "parse_list",
+    "parse_norm_map",
+    "read_chunks",
+    "read_columns",
+    "read_header",
+    "record_maps_from_table",
+    "similar_pairs",
+    "similarity_matrix",
+    "split_items",
+    "write_column",
+    "write_export",
+    "write_index",
+]
@@ -0,0 +1,205 @@
+"""
+Bloom-filter prefiltered comparison for a large reference list A against a
+small list B.
+
+A is streamed into a bit array instead of a set. B is held in memory and
+tested against the filter; the few candidate hits are then confirmed by a
+second streaming pass over A, so the intersection and B-only regions stay
+exact while memory is dominated by the filter (about 1.2 bytes per A item
+at a 1% error rate).
+
+A saved filter records the parsing options and the source it was built
+from, so a caller can tell whether it still matches the current list.
+"""
+import json
+import math
+import os
+import struct
+from functools import cached_property
+from hashlib import blake2b
+from typing import BinaryIO, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .engine import REGIONS, BaseComparison
+from .normalize import Pipeline
+from .sketches import iter_file_keys
+from .streaming import DEFAULT_CHUNK_SIZE
+
+
+DEFAULT_ERROR_RATE = 0.01
+
+_MAGIC = b"LCBLOOM2"
+_MAGIC_V1 = b"LCBLOOM1"  # no metadata
+_HEADER = struct.Struct("<QQQQ")  # bits, hashes, count, meta length
+_HEADER_V1 = struct.Struct("<QQQ")
+
+
+class BloomFilter:
+    """
+    Bloom filter over normalized keys, sized for ``capacity`` distinct keys.
+
+    ``len()`` counts the adds that set at least one new bit, an estimate of
+    the distinct keys inserted that undercounts by about the error rate.
+    ``options`` (JSON-serializable parsing options) and ``source`` (an
+    identifier of the input list) are saved with the filter.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        options: Optional[Dict] = None,
+        source: str = "",
+    ):
+        capacity = max(capacity, 1)
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self.options = options or {}
+        self.source = source
+
+    def _positions(self, key: Hashable) -> Iterator[int]:
+        data = key.encode("utf-8", "surrogatepass") if isinstance(key, str) else bytes(key)
+        digest = blake2b(data, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def add(self, key: Hashable):
+        bits = self.bits
+        added = False
+        for pos in self._positions(key):
+            byte, bit = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & bit:
+                bits[byte] |= bit
+                added = True
+        if added:
+            self.count += 1
+
+    def update(self, keys: Iterable[Hashable]):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+    # Persistence
+    def save(self, path: str):
+        meta = json.dumps({"options": self.options, "source": self.source}).encode("utf-8")
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER.pack(self.num_bits, self.num_hashes, self.count, len(meta)))
+            f.write(meta)
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """
+        Reads a saved filter. Filters saved before metadata was recorded
+        load with empty options and source.
+        """
+        meta = {}
+        with open(path, "rb") as f:
+            magic = f.read(len(_MAGIC))
+            if magic == _MAGIC:
+                num_bits, num_hashes, count, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+                meta = json.loads(f.read(meta_len))
+            elif magic == _MAGIC_V1:
+                num_bits, num_hashes, count = _HEADER_V1.unpack(f.read(_HEADER_V1.size))
+            else:
+                raise ValueError(f"{path} is not a saved Bloom filter")
+            bits = bytearray(f.read())
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError(f"{path} is truncated")
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        bloom.count = count
+        bloom.options = meta.get("options", {})
+        bloom.source = meta.get("source", "")
+        return bloom
+
+
+def bloom_from_file(
+    fp: BinaryIO,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    capacity: int,
+    error_rate: float = DEFAULT_ERROR_RATE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pipeline: Optional[Pipeline] = None,
+) -> BloomFilter:
+    """
+    Streams a file's normalized keys into a new Bloom filter.
+    """
+    bloom = BloomFilter(capacity, error_rate)
+    bloom.update(iter_file_keys(
+        fp, delim_mode, custom_delim, case_sensitive, strip_items, chunk_size, pipeline
+    ))
+    return bloom
+
+
+class BloomComparison(BaseComparison):
+    """
+    Comparison of a Bloom-filtered list A against an in-memory list B.
+
+    B's keys that hit the filter are candidates; passing ``pairs_a`` (a
+    second stream of A's (normalized, original) pairs) confirms them
+    exactly. Without it, the intersection may contain false positives at
+    the filter's error rate and shows B's originals. The A-only count is
+    derived from the filter's distinct-add count and is approximate; its
+    items are not available.
+    """
+
+    approximate_regions: Tuple[str, ...] = ("A_only",)
+
+    def __init__(
+        self,
+        bloom: BloomFilter,
+        norm_map_b: Dict[Hashable, str],
+        pairs_a: Optional[Iterable[Tuple[Hashable, str]]] = None,
+    ):
+        self.bloom = bloom
+        self.norm_map_b = norm_map_b
+        self.verified = pairs_a is not None
+        self.inter_map: Dict[Hashable, str] = {}
+        candidates: Set[Hashable] = {n for n in norm_map_b if n in bloom}
+
+        if pairs_a is None:
+            self.inter_map = {n: norm_map_b[n] for n in candidates}
+        else:
+            for norm, raw in pairs_a:
+                if norm in candidates and norm not in self.inter_map:
+                    self.inter_map[norm] = raw
+                    if len(self.inter_map) == len(candidates):
+                        break
+
+        if not self.verified:
+            self.approximate_regions = REGIONS
+
+    @property
+    def intersection(self) -> List[str]:
+        return list(self.inter_map.values())
+
+    @property
+    def B_only(self) -> List[str]:
+        return [raw for n, raw in self.norm_map_b.items() if n not in self.inter_map]
+
+    @cached_property
+    def counts(self) -> Dict[str, int]:
+        inter = len(self.inter_map)
+        return {
+            "A_only": max(len(self.bloom) - inter, 0),
+            "intersection": inter,
+            "B_only": len(self.norm_map_b) - inter,
+        }
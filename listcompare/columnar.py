@@ -0,0 +1,175 @@
+"""
+Parquet and Arrow IPC input and output.
+
+Readers project only the key column(s) and stream them batch by batch, so
+other columns are never loaded. Writers emit a region as a single "Item"
+string column straight from its items, without formatting text first.
+
+pyarrow is an optional dependency, imported on first use.
+"""
+import importlib.util
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence
+
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+BATCH_ROWS = 65_536
+
+_ARROW_FILE_MAGIC = b"ARROW1"
+
+
+def pyarrow_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet and Arrow support requires the 'pyarrow' package") from None
+    return pyarrow
+
+
+def _new_writer(path: str, fmt: str, schema):
+    pa = _pyarrow()
+    if fmt == "parquet":
+        return pa.parquet.ParquetWriter(path, schema)
+    return pa.ipc.new_file(path, schema)
+
+
+def _check_format(fmt: str):
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format: {fmt!r}")
+
+
+def _open_arrow(fp: BinaryIO, options=None):
+    # Arrow IPC files start with a magic string; streams do not.
+    pa = _pyarrow()
+    pos = fp.tell()
+    is_file = fp.read(len(_ARROW_FILE_MAGIC)) == _ARROW_FILE_MAGIC
+    fp.seek(pos)
+    if is_file:
+        return pa.ipc.open_file(fp, options=options)
+    return pa.ipc.open_stream(fp, options=options)
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def read_columns(fp: BinaryIO, fmt: str) -> List[str]:
+    """
+    Column names from a Parquet or Arrow file's schema. ``fp`` is rewound
+    afterwards.
+    """
+    _check_format(fmt)
+    pa = _pyarrow()
+    pos = fp.tell()
+    try:
+        if fmt == "parquet":
+            return pa.parquet.ParquetFile(fp).schema_arrow.names
+        return _open_arrow(fp).schema.names
+    finally:
+        fp.seek(pos)
+
+
+def _iter_key_columns(fp: BinaryIO, fmt: str, key_columns: Sequence[int]) -> Iterator[list]:
+    # Yields, per record batch, the key columns in the order requested.
+    pa = _pyarrow()
+    if fmt == "parquet":
+        parquet = pa.parquet.ParquetFile(fp)
+        names = parquet.schema_arrow.names
+        selected = [names[c] for c in key_columns]
+        for batch in parquet.iter_batches(batch_size=BATCH_ROWS, columns=selected):
+            yield [batch.column(name) for name in selected]
+        return
+
+    # IPC projection keeps schema order, so map each key column to its
+    # position among the included fields.
+    included = sorted(set(key_columns))
+    reader = _open_arrow(fp, pa.ipc.IpcReadOptions(included_fields=included))
+    positions = [included.index(c) for c in key_columns]
+    if isinstance(reader, pa.ipc.RecordBatchFileReader):
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    else:
+        batches = iter(reader)
+    for batch in batches:
+        yield [batch.column(p) for p in positions]
+
+
+def _column_strings(column) -> List[Optional[str]]:
+    pa = _pyarrow()
+    if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+        try:
+            column = column.cast(pa.string())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return [None if v is None else str(v) for v in column.to_pylist()]
+    return column.to_pylist()
+
+
+def iter_column_fields(fp: BinaryIO, fmt: str, key_columns: Sequence[int]) -> Iterator[List[str]]:
+    """
+    Yields the key fields of every row of a Parquet or Arrow file, reading
+    only the key column(s). Non-string columns are cast to strings; nulls
+    count as empty fields.
+    """
+    _check_format(fmt)
+    for columns in _iter_key_columns(fp, fmt, key_columns):
+        values = [_column_strings(c) for c in columns]
+        for row in zip(*values):
+            yield [v or "" for v in row]
+
+
+# -----------------------------
+# Writing
+# -----------------------------
+def write_column(
+    items: Iterable[str],
+    path: str,
+    fmt: str,
+    name: str = "Item",
+    batch_rows: int = BATCH_ROWS,
+):
+    """
+    Writes items as a one-column Parquet or Arrow IPC file, one record
+    batch at a time.
+    """
+    _check_format(fmt)
+    pa = _pyarrow()
+    schema = pa.schema([(name, pa.string())])
+    items = iter(items)
+    with _new_writer(path, fmt, schema) as writer:
+        while True:
+            batch = list(islice(items, batch_rows))
+            if not batch:
+                break
+            writer.write_batch(pa.record_batch([pa.array(batch, pa.string())], schema=schema))
+
+
+def write_rows(
+    rows: Iterable[Sequence],
+    path: str,
+    fmt: str,
+    columns: Sequence[str],
+    batch_rows: int = BATCH_ROWS,
+):
+    """
+    Writes tuples as a Parquet or Arrow IPC file with the given column
+    names. Column types are inferred from the first batch; an empty file
+    has string columns.
+    """
+    _check_format(fmt)
+    pa = _pyarrow()
+    rows = iter(rows)
+    batch = list(islice(rows, batch_rows))
+    if batch:
+        first = pa.record_batch([pa.array(col) for col in zip(*batch)], names=list(columns))
+        schema = first.schema
+    else:
+        schema = pa.schema([(name, pa.string()) for name in columns])
+    with _new_writer(path, fmt, schema) as writer:
+        while batch:
+            arrays = [pa.array(col, type=field.type) for col, field in zip(zip(*batch), schema)]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            batch = list(islice(rows, batch_rows))
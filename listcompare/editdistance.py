@@ -0,0 +1,158 @@
+"""
+Edit-distance matching of short codes with a BK-tree.
+
+Levenshtein distance is a metric, so a BK-tree can prune by the triangle
+inequality: each child hangs off its parent at their exact distance, and
+a query within distance k of a node at distance d only descends into the
+children at distances d - k .. d + k. For small k, a query visits a small
+fraction of the tree instead of every item.
+
+Distances use the bit-parallel algorithm of Myers (1999), with the query
+as the bit pattern, so each distance costs one pass over the other string.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .engine import ListComparison
+from .fuzzy import FuzzyComparison, FuzzyMatch
+
+
+DEFAULT_MAX_DISTANCE = 1
+
+Pattern = Tuple[Dict[str, int], int]
+
+
+def _pattern(text: str) -> Pattern:
+    """
+    Per-character bit masks of ``text``, reusable across distances.
+    """
+    masks: Dict[str, int] = {}
+    for i, c in enumerate(text):
+        masks[c] = masks.get(c, 0) | 1 << i
+    return masks, len(text)
+
+
+def _distance(pattern: Pattern, text: str) -> int:
+    masks, m = pattern
+    if not m:
+        return len(text)
+    all_ones = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = all_ones, 0, m
+    for c in text:
+        eq = masks.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & all_ones
+        mv = ph & xv & all_ones
+    return score
+
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    Minimum number of single-character insertions, deletions and
+    substitutions turning ``a`` into ``b``.
+    """
+    return _distance(_pattern(a), b)
+
+
+class BKTree:
+    """
+    BK-tree over ``items`` under Levenshtein distance. Equal items share a
+    node.
+    """
+
+    def __init__(self, items: Sequence[str]):
+        self.items = items
+        # Node: (text, item indexes, children by distance)
+        self._root: Optional[Tuple[str, List[int], Dict[int, tuple]]] = None
+        for i, text in enumerate(items):
+            self._add(i, text)
+
+    def _add(self, i: int, text: str):
+        if self._root is None:
+            self._root = (text, [i], {})
+            return
+        pattern = _pattern(text)
+        node = self._root
+        while True:
+            d = _distance(pattern, node[0])
+            if d == 0:
+                node[1].append(i)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = (text, [i], {})
+                return
+            node = child
+
+    def query(self, text: str, max_distance: int) -> List[Tuple[int, int]]:
+        """
+        (item index, distance) of every item within ``max_distance``.
+        """
+        if self._root is None:
+            return []
+        pattern = _pattern(text)
+        matches = []
+        stack = [self._root]
+        while stack:
+            node_text, indexes, children = stack.pop()
+            d = _distance(pattern, node_text)
+            if d <= max_distance:
+                matches.extend((i, d) for i in indexes)
+            for child_d, child in children.items():
+                if d - max_distance <= child_d <= d + max_distance:
+                    stack.append(child)
+        return matches
+
+    def best_match(self, text: str, max_distance: int) -> Tuple[int, int]:
+        """
+        Closest item as (index, distance), or (-1, -1) if none is within
+        ``max_distance``. Ties go to the earliest item.
+        """
+        return min(self.query(text, max_distance), key=lambda m: (m[1], m[0]), default=(-1, -1))
+
+
+def edit_distance_join(
+    items_a: Sequence[str],
+    items_b: Sequence[str],
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+) -> List[FuzzyMatch]:
+    """
+    Pairs every item of A with its closest item of B within
+    ``max_distance`` edits, as (index in A, index in B, distance). B is
+    indexed; an item of B may be the best match of several items of A.
+    """
+    if max_distance < 0:
+        raise ValueError("Maximum edit distance must not be negative")
+    tree = BKTree(items_b)
+    matches = []
+    for i, text in enumerate(items_a):
+        j, distance = tree.best_match(text, max_distance)
+        if j >= 0:
+            matches.append((i, j, distance))
+    return matches
+
+
+class EditDistanceComparison(FuzzyComparison):
+    """
+    FuzzyComparison whose "fuzzy" region pairs one-sided items within
+    ``max_distance`` edits (Levenshtein distance of the case-folded
+    originals), for short codes such as SKUs and IDs.
+    """
+
+    FUZZY_COLUMNS = ("A item", "B item", "Distance")
+
+    def __init__(self, base: ListComparison, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._pair_one_sided(base)
+
+    def _join(self, items_a: List[str], items_b: List[str]) -> List[FuzzyMatch]:
+        return edit_distance_join(items_a, items_b, self.max_distance)
@@ -0,0 +1,314 @@
+from functools import cached_property
+from itertools import chain, islice
+from typing import Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from .normalize import Pipeline, compile_keys, compile_normalizer, iter_batches
+from .vectorized import can_vectorize, vectorized_parse_list, vectorized_parse_norm_map
+
+
+REGIONS = ("A_only", "intersection", "B_only")
+
+
+# -----------------------------
+# Parsing
+# -----------------------------
+def split_items(text: str, delim_mode: str, custom_delim: str) -> List[str]:
+    """
+    Splits raw text into parts according to the delimiter mode.
+    """
+    text = text or ""
+
+    if delim_mode == "newline":
+        return text.splitlines()
+    if delim_mode == "comma":
+        return text.split(",")
+    if delim_mode == "semicolon":
+        return text.split(";")
+    if delim_mode == "whitespace":
+        return text.split()
+    if delim_mode == "custom":
+        return text.split(custom_delim) if custom_delim else [text]
+
+    # auto
+    parts = text.splitlines()
+    if len(parts) <= 1:
+        parts = text.split(",")
+    return parts
+
+
+def parse_list(
+    text: str,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    pipeline: Optional[Pipeline] = None,
+    vectorize: bool = True,
+) -> Tuple[List[str], Set[str]]:
+    """
+    Parses the raw text into a cleaned list and a normalized set.
+    ``vectorize=False`` forces the pure-Python path.
+    """
+    text = text or ""
+    if vectorize and can_vectorize(text, pipeline):
+        return vectorized_parse_list(text, delim_mode, custom_delim, case_sensitive, strip_items)
+    normalize = compile_normalizer(case_sensitive, strip_items, pipeline)
+    pairs = list(normalize(split_items(text, delim_mode, custom_delim)))
+    return [item for _, item in pairs], {norm for norm, _ in pairs}
+
+
+def build_norm_map(
+    original_list: List[str],
+    case_sensitive: bool,
+    pipeline: Optional[Pipeline] = None,
+) -> Dict[str, str]:
+    """
+    Builds a mapping from normalized value -> first-seen original value.
+    """
+    mapping = {}
+    for norm, raw in zip(compile_keys(case_sensitive, pipeline)(original_list), original_list):
+        mapping.setdefault(norm, raw)
+    return mapping
+
+
+def normalize_items(
+    parts: Iterable[str],
+    case_sensitive: bool,
+    strip_items: bool,
+    pipeline: Optional[Pipeline] = None,
+) -> Dict[str, str]:
+    """
+    Cleans, normalizes and deduplicates parts in a single pass.
+
+    Returns a mapping from normalized value -> first-seen original value; its
+    keys are the normalized set, so no separate list or set copies are made.
+    """
+    return norm_map_from_pairs(iter_norm_pairs(parts, case_sensitive, strip_items, pipeline))
+
+
+def iter_norm_pairs(
+    parts: Iterable[str],
+    case_sensitive: bool,
+    strip_items: bool,
+    pipeline: Optional[Pipeline] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yields (normalized, original) for every part with a non-empty key,
+    duplicates included. Parts are normalized in batches by the compiled
+    pipeline.
+    """
+    normalize = compile_normalizer(case_sensitive, strip_items, pipeline)
+    return chain.from_iterable(map(normalize, iter_batches(parts)))
+
+
+def norm_map_from_pairs(pairs: Iterable[Tuple[Hashable, str]]) -> Dict[Hashable, str]:
+    """
+    Keeps the first-seen original of each normalized key.
+    """
+    mapping = {}
+    for norm, raw in pairs:
+        if norm not in mapping:
+            mapping[norm] = raw
+    return mapping
+
+
+def parse_norm_map(
+    text: str,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    pipeline: Optional[Pipeline] = None,
+    vectorize: bool = True,
+) -> Dict[str, str]:
+    """
+    Fused parse_list + build_norm_map in one tokenize/normalize pass.
+    ASCII text without a pipeline goes through Arrow string kernels when
+    pyarrow is installed, unless ``vectorize`` is False.
+    """
+    text = text or ""
+    if vectorize and can_vectorize(text, pipeline):
+        return vectorized_parse_norm_map(text, delim_mode, custom_delim, case_sensitive, strip_items)
+    return normalize_items(
+        split_items(text, delim_mode, custom_delim), case_sensitive, strip_items, pipeline
+    )
+
+
+# -----------------------------
+# Similarity
+# -----------------------------
+def jaccard_index(counts: Mapping[str, int]) -> float:
+    """
+    Intersection / union, computed from region counts.
+    """
+    union = counts["A_only"] + counts["intersection"] + counts["B_only"]
+    return counts["intersection"] / union if union else 0.0
+
+
+def overlap_coefficient(counts: Mapping[str, int]) -> float:
+    """
+    Intersection / smaller set size, computed from region counts.
+    """
+    smaller = min(
+        counts["A_only"] + counts["intersection"],
+        counts["B_only"] + counts["intersection"],
+    )
+    return counts["intersection"] / smaller if smaller > 0 else 0.0
+
+
+# -----------------------------
+# Comparison
+# -----------------------------
+class BaseComparison:
+    """
+    Interface shared by the comparison engines.
+
+    Subclasses provide ``counts`` (region -> size) and ``iter_region``;
+    similarity scores and paging are derived from those.
+    """
+
+    counts: Dict[str, int]
+
+    def region_columns(self, region: str) -> Tuple[str, ...]:
+        """
+        Column names of a region. Single-column regions yield plain strings;
+        wider ones yield tuples with one value per column.
+        """
+        return ("Item",)
+
+    def iter_region(self, region: str, sort: bool = False) -> Iterator[str]:
+        """
+        Streams a region's items, sorted if ``sort``. The default reads the
+        region's list attribute; engines with larger regions override it.
+        """
+        items = getattr(self, region)
+        return iter(sorted(items) if sort else items)
+
+    def page(self, region: str, start: int, stop: Optional[int], sort: bool = False) -> List[str]:
+        """
+        Items start:stop of a region.
+        """
+        return list(islice(self.iter_region(region, sort), start, stop))
+
+    @property
+    def jaccard(self) -> float:
+        return jaccard_index(self.counts)
+
+    @property
+    def overlap(self) -> float:
+        return overlap_coefficient(self.counts)
+
+
+class ListComparison(BaseComparison):
+    """
+    Set comparison of two lists given as normalized value -> original value maps.
+
+    Region sets and lists are computed on first access and cached; counts
+    only need the intersection, and paging only builds the region shown.
+    """
+
+    def __init__(self, norm_map_a: Dict[Hashable, str], norm_map_b: Dict[Hashable, str]):
+        self.norm_map_a = norm_map_a
+        self.norm_map_b = norm_map_b
+        self._region_keys: Dict[Tuple[str, bool], List[Hashable]] = {}
+
+    @classmethod
+    def from_lists(
+        cls,
+        list_a: List[str],
+        list_b: List[str],
+        case_sensitive: bool = False,
+        pipeline: Optional[Pipeline] = None,
+    ) -> "ListComparison":
+        return cls(
+            build_norm_map(list_a, case_sensitive, pipeline),
+            build_norm_map(list_b, case_sensitive, pipeline),
+        )
+
+    @classmethod
+    def from_text(
+        cls,
+        text_a: str,
+        text_b: str,
+        delim_mode: str = "auto",
+        custom_delim: str = "",
+        case_sensitive: bool = False,
+        strip_items: bool = True,
+        pipeline: Optional[Pipeline] = None,
+    ) -> "ListComparison":
+        options = (delim_mode, custom_delim, case_sensitive, strip_items, pipeline)
+        return cls(parse_norm_map(text_a, *options), parse_norm_map(text_b, *options))
+
+    # Normalized regions
+    @cached_property
+    def inter_norm(self) -> Set[Hashable]:
+        return self.norm_map_a.keys() & self.norm_map_b.keys()
+
+    @cached_property
+    def A_only_norm(self) -> Set[Hashable]:
+        return self.norm_map_a.keys() - self.norm_map_b.keys()
+
+    @cached_property
+    def B_only_norm(self) -> Set[Hashable]:
+        return self.norm_map_b.keys() - self.norm_map_a.keys()
+
+    # Regions mapped back to first-seen originals
+    @property
+    def A_only(self) -> List[str]:
+        return [self.norm_map_a[n] for n in self.A_only_norm]
+
+    @property
+    def B_only(self) -> List[str]:
+        return [self.norm_map_b[n] for n in self.B_only_norm]
+
+    @property
+    def intersection(self) -> List[str]:
+        return [self.norm_map_a[n] for n in self.inter_norm]
+
+    # Paging
+    def _region_map(self, region: str) -> Dict[Hashable, str]:
+        return self.norm_map_b if region == "B_only" else self.norm_map_a
+
+    def region_keys(self, region: str, sort: bool = False) -> List[Hashable]:
+        """
+        Normalized keys of a region in a stable order, cached per (region, sort).
+
+        When sorting, keys are ordered by their original value.
+        """
+        cache_key = (region, sort)
+        keys = self._region_keys.get(cache_key)
+        if keys is None:
+            if region == "intersection":
+                keys = list(self.inter_norm)
+            else:
+                # Built straight from the maps; no intermediate difference set.
+                own, other = (
+                    (self.norm_map_a, self.norm_map_b) if region == "A_only"
+                    else (self.norm_map_b, self.norm_map_a)
+                )
+                keys = [n for n in own if n not in other]
+            if sort:
+                keys.sort(key=self._region_map(region).__getitem__)
+            self._region_keys[cache_key] = keys
+        return keys
+
+    def iter_region(self, region: str, sort: bool = False) -> Iterator[str]:
+        mapping = self._region_map(region)
+        return (mapping[n] for n in self.region_keys(region, sort))
+
+    def page(self, region: str, start: int, stop: Optional[int], sort: bool = False) -> List[str]:
+        # Only the requested slice is mapped back to originals.
+        mapping = self._region_map(region)
+        return [mapping[n] for n in self.region_keys(region, sort)[start:stop]]
+
+    # Summary
+    @property
+    def counts(self) -> Dict[str, int]:
+        # Only the intersection is needed; the one-sided regions follow from
+        # the set sizes and are never built just to be counted.
+        inter = len(self.inter_norm)
+        return {
+            "A_only": len(self.norm_map_a) - inter,
+            "intersection": inter,
+            "B_only": len(self.norm_map_b) - inter,
+        }
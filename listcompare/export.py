@@ -0,0 +1,161 @@
+"""
+Chunked export of region items to TXT or CSV, optionally compressed, or
+to Parquet and Arrow IPC.
+
+Items are consumed from an iterator and written in batches, so an export
+never holds more than one batch of formatted text in memory. Compression
+is applied as a stream on the way to disk; the columnar formats use their
+own encodings and ignore it.
+"""
+import csv
+import gzip
+import io
+import os
+import tempfile
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+from .columnar import COLUMNAR_FORMATS, pyarrow_available, write_column, write_rows
+
+EXPORT_FORMATS = ("txt", "csv")
+MIME_TYPES = {
+    "txt": "text/plain",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+CHUNK_ITEMS = 10_000
+DEFAULT_COLUMNS = ("Item",)
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+COMPRESSED_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+COMPRESSED_MIME_TYPES = {"gzip": "application/gzip", "zstd": "application/zstd"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def iter_export_chunks(
+    items: Iterable,
+    fmt: str,
+    chunk_items: int = CHUNK_ITEMS,
+    columns: Sequence[str] = DEFAULT_COLUMNS,
+) -> Iterator[str]:
+    """
+    Yields the export text in chunks of ``chunk_items`` items.
+
+    TXT is newline-joined without a trailing newline; CSV has a header row
+    and quotes fields as needed. With several ``columns`` the items are
+    tuples, tab-separated in TXT.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+    items = iter(items)
+    single = len(columns) == 1
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(columns)
+        while True:
+            batch = list(islice(items, chunk_items))
+            if not batch:
+                break
+            writer.writerows(([item] for item in batch) if single else batch)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+        return
+
+    first = True
+    while True:
+        batch = list(islice(items, chunk_items))
+        if not batch:
+            break
+        if not single:
+            batch = ["\t".join(map(str, row)) for row in batch]
+        yield ("" if first else "\n") + "\n".join(batch)
+        first = False
+
+
+def write_export(
+    items: Iterable,
+    fp: IO[str],
+    fmt: str,
+    chunk_items: int = CHUNK_ITEMS,
+    columns: Sequence[str] = DEFAULT_COLUMNS,
+):
+    """
+    Writes an export to an open text file.
+    """
+    for chunk in iter_export_chunks(items, fmt, chunk_items, columns):
+        fp.write(chunk)
+
+
+def available_formats() -> List[str]:
+    return list(EXPORT_FORMATS) + (list(COLUMNAR_FORMATS) if pyarrow_available() else [])
+
+
+def available_compressions() -> List[str]:
+    return [c for c in COMPRESSIONS if c != "zstd" or zstandard is not None]
+
+
+def export_suffix(fmt: str, compression: str = "none") -> str:
+    if fmt in COLUMNAR_FORMATS:
+        return f".{fmt}"
+    return f".{fmt}{COMPRESSED_SUFFIXES[compression]}"
+
+
+def export_mime_type(fmt: str, compression: str = "none") -> str:
+    if fmt in COLUMNAR_FORMATS:
+        return MIME_TYPES[fmt]
+    return COMPRESSED_MIME_TYPES.get(compression, MIME_TYPES[fmt])
+
+
+def open_export(path: str, compression: str = "none") -> IO[str]:
+    """
+    Opens ``path`` for writing text, compressing on the fly.
+    """
+    if compression == "none":
+        return open(path, "w", encoding="utf-8", newline="")
+    if compression == "gzip":
+        return gzip.open(path, "wt", compresslevel=GZIP_LEVEL, encoding="utf-8", newline="")
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd export requires the 'zstandard' package")
+        return zstandard.open(
+            path, "wt", cctx=zstandard.ZstdCompressor(level=ZSTD_LEVEL),
+            encoding="utf-8", newline="",
+        )
+    raise ValueError(f"Unknown compression: {compression!r}")
+
+
+def export_to_tempfile(
+    items: Iterable,
+    fmt: str,
+    compression: str = "none",
+    directory: Optional[str] = None,
+    columns: Sequence[str] = DEFAULT_COLUMNS,
+) -> str:
+    """
+    Writes an export to a new temporary file and returns its path.
+
+    The caller is responsible for removing the file.
+    """
+    fd, path = tempfile.mkstemp(suffix=export_suffix(fmt, compression), prefix="listcompare-", dir=directory)
+    os.close(fd)
+    if fmt in COLUMNAR_FORMATS:
+        if len(columns) == 1:
+            write_column(items, path, fmt, columns[0])
+        else:
+            write_rows(items, path, fmt, columns)
+        return path
+    with open_export(path, compression) as f:
+        write_export(items, f, fmt, columns=columns)
+    return path
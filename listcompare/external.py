@@ -0,0 +1,334 @@
+"""
+Out-of-core comparison by external merge sort.
+
+Each input is deduplicated into sorted runs of at most ``run_size`` distinct
+keys, spilled to temporary files, then k-way merged into one sorted unique
+stream. A merge-join of the two streams writes the three regions to files
+of pickled batches, like the runs, so memory stays bounded by the run size
+and items containing line breaks survive the round trip. A region asked
+for in alphabetical order is externally sorted the same way, once.
+
+With ``workers`` > 1 both inputs are first split on disk into one
+partition per worker by hash of the normalized key, so equal keys always
+meet in the same partition. Each worker process sorts and merge-joins its
+partition pair and writes its own region files; the parent only appends
+those files together and adds up the counts, so no items travel back
+through the pool. Partitioning happens in the parent, so the per-process
+str hash seed does not matter.
+"""
+import heapq
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .engine import REGIONS, BaseComparison
+from .normalize import Pipeline
+from .streaming import DEFAULT_CHUNK_SIZE, iter_file_pairs
+
+
+DEFAULT_RUN_SIZE = 1_000_000  # distinct keys held in memory per run
+_BATCH_SIZE = 10_000  # pairs (or items) per pickle record in a run or region file
+
+Pair = Tuple[str, str]
+
+
+# -----------------------------
+# Sorted runs
+# -----------------------------
+def _write_batches(items: Iterable, f: BinaryIO):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= _BATCH_SIZE:
+            pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+            batch = []
+    if batch:
+        pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+
+
+def _write_run(items: List, directory: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    items.sort()
+    with os.fdopen(fd, "wb") as f:
+        _write_batches(items, f)
+    return path
+
+
+def _read_batches(path: str) -> Iterator:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def iter_sorted_unique(
+    pairs: Iterable[Pair],
+    directory: str,
+    run_size: int = DEFAULT_RUN_SIZE,
+) -> Iterator[Pair]:
+    """
+    Yields (normalized, first-seen original) sorted by normalized value.
+
+    Inputs that fit in a single run never touch the disk.
+    """
+    runs: List[str] = []
+    run: Dict[str, str] = {}
+    for norm, raw in pairs:
+        if norm not in run:
+            run[norm] = raw
+            if len(run) >= run_size:
+                runs.append(_write_run(list(run.items()), directory))
+                run = {}
+
+    if not runs:
+        yield from sorted(run.items())
+        return
+    if run:
+        runs.append(_write_run(list(run.items()), directory))
+
+    # heapq.merge is stable, so for equal keys the earliest run comes first
+    # and holds the first-seen original.
+    last = None
+    for norm, raw in heapq.merge(*map(_read_batches, runs), key=itemgetter(0)):
+        if norm != last:
+            last = norm
+            yield norm, raw
+
+
+def iter_sorted(items: Iterable[str], directory: str, run_size: int = DEFAULT_RUN_SIZE) -> Iterator[str]:
+    """
+    Yields ``items`` in sorted order, spilling sorted runs of ``run_size``
+    items to ``directory`` when they do not fit in one.
+    """
+    runs: List[str] = []
+    run: List[str] = []
+    for item in items:
+        run.append(item)
+        if len(run) >= run_size:
+            runs.append(_write_run(run, directory))
+            run = []
+    if not runs:
+        yield from sorted(run)
+        return
+    if run:
+        runs.append(_write_run(run, directory))
+    yield from heapq.merge(*map(_read_batches, runs))
+
+
+def merge_join(sorted_a: Iterable[Pair], sorted_b: Iterable[Pair]) -> Iterator[Tuple[str, str]]:
+    """
+    Merge-joins two sorted unique streams into (region, original) pairs.
+    """
+    a = iter(sorted_a)
+    b = iter(sorted_b)
+    item_a = next(a, None)
+    item_b = next(b, None)
+    while item_a is not None and item_b is not None:
+        if item_a[0] == item_b[0]:
+            yield "intersection", item_a[1]
+            item_a = next(a, None)
+            item_b = next(b, None)
+        elif item_a[0] < item_b[0]:
+            yield "A_only", item_a[1]
+            item_a = next(a, None)
+        else:
+            yield "B_only", item_b[1]
+            item_b = next(b, None)
+    while item_a is not None:
+        yield "A_only", item_a[1]
+        item_a = next(a, None)
+    while item_b is not None:
+        yield "B_only", item_b[1]
+        item_b = next(b, None)
+
+
+def _write_regions(joined: Iterable[Tuple[str, str]], paths: Dict[str, str]) -> Dict[str, int]:
+    """
+    Writes merge_join() output to one file of pickled batches per region
+    and returns the region counts.
+    """
+    counts = dict.fromkeys(REGIONS, 0)
+    files = {region: open(path, "wb") for region, path in paths.items()}
+    batches: Dict[str, List[str]] = {region: [] for region in REGIONS}
+    try:
+        for region, raw in joined:
+            batch = batches[region]
+            batch.append(raw)
+            if len(batch) >= _BATCH_SIZE:
+                pickle.dump(batch, files[region], pickle.HIGHEST_PROTOCOL)
+                batch.clear()
+            counts[region] += 1
+        for region, batch in batches.items():
+            if batch:
+                pickle.dump(batch, files[region], pickle.HIGHEST_PROTOCOL)
+    finally:
+        for f in files.values():
+            f.close()
+    return counts
+
+
+# -----------------------------
+# Hash partitions
+# -----------------------------
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _write_partitions(pairs: Iterable[Pair], directory: str, prefix: str, n: int) -> List[str]:
+    """
+    Splits pairs into ``n`` partition files by hash of the normalized key.
+    Batches are deduplicated and input order is kept within a partition,
+    so the first-seen original of each key still comes first.
+    """
+    paths = [os.path.join(directory, f"{prefix}{i}.part") for i in range(n)]
+    files = [open(path, "wb") for path in paths]
+    batches: List[Dict[str, str]] = [{} for _ in range(n)]
+    try:
+        for norm, raw in pairs:
+            i = hash(norm) % n
+            batch = batches[i]
+            if norm not in batch:
+                batch[norm] = raw
+                if len(batch) >= _BATCH_SIZE:
+                    pickle.dump(list(batch.items()), files[i], pickle.HIGHEST_PROTOCOL)
+                    batch.clear()
+        for f, batch in zip(files, batches):
+            if batch:
+                pickle.dump(list(batch.items()), f, pickle.HIGHEST_PROTOCOL)
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+def _join_partition(
+    path_a: str, path_b: str, region_paths: Dict[str, str], run_size: int
+) -> Dict[str, int]:
+    # Runs in a worker process; spills next to its partition files.
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(path_a)) as spill_dir:
+        joined = merge_join(
+            iter_sorted_unique(_read_batches(path_a), spill_dir, run_size),
+            iter_sorted_unique(_read_batches(path_b), spill_dir, run_size),
+        )
+        counts = _write_regions(joined, region_paths)
+    os.remove(path_a)
+    os.remove(path_b)
+    return counts
+
+
+# -----------------------------
+# Comparison
+# -----------------------------
+class ExternalComparison(BaseComparison):
+    """
+    Disk-backed counterpart of ListComparison for lists larger than RAM.
+
+    Regions are written to ``<out_dir>/<region>.pkl`` in normalized-key
+    order (per partition when ``workers`` > 1), as pickled batches of
+    originals that iter_region() reads back. Each of the ``workers``
+    processes holds at most ``run_size // workers`` keys, so memory stays
+    bounded by ``run_size`` either way.
+    The first sorted read of a region writes ``<region>.sorted.pkl``, in
+    order of the originals, for later ones. When ``out_dir`` is not given a
+    temporary directory is used and removed once the object is garbage
+    collected.
+    """
+
+    def __init__(
+        self,
+        pairs_a: Iterable[Pair],
+        pairs_b: Iterable[Pair],
+        out_dir: Optional[str] = None,
+        run_size: int = DEFAULT_RUN_SIZE,
+        workers: int = 1,
+    ):
+        if out_dir is None:
+            out_dir = tempfile.mkdtemp(prefix="listcompare-")
+            weakref.finalize(self, shutil.rmtree, out_dir, True)
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.run_size = run_size
+        region_paths = {region: self.region_path(region) for region in REGIONS}
+
+        if workers <= 1:
+            with tempfile.TemporaryDirectory(dir=out_dir) as spill_dir:
+                joined = merge_join(
+                    iter_sorted_unique(pairs_a, spill_dir, run_size),
+                    iter_sorted_unique(pairs_b, spill_dir, run_size),
+                )
+                self.counts = _write_regions(joined, region_paths)
+            return
+
+        self.counts = dict.fromkeys(REGIONS, 0)
+        with tempfile.TemporaryDirectory(dir=out_dir) as part_dir:
+            parts_a = _write_partitions(pairs_a, part_dir, "a", workers)
+            parts_b = _write_partitions(pairs_b, part_dir, "b", workers)
+            part_regions = [
+                {region: os.path.join(part_dir, f"{region}.{i}.pkl") for region in REGIONS}
+                for i in range(workers)
+            ]
+            # Streamlit runs the app script as __main__, which spawned workers
+            # would import and so re-run; forked ones start from a copy.
+            fork = "fork" in multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if fork else None)
+            with ProcessPoolExecutor(workers, mp_context=context) as pool:
+                part_counts = pool.map(
+                    _join_partition, parts_a, parts_b, part_regions,
+                    [max(1, run_size // workers)] * workers,
+                )
+                for counts in part_counts:
+                    for region, count in counts.items():
+                        self.counts[region] += count
+            # Pickle streams concatenate, so the parts are simply appended.
+            for region, path in region_paths.items():
+                with open(path, "wb") as out:
+                    for paths in part_regions:
+                        with open(paths[region], "rb") as part:
+                            shutil.copyfileobj(part, out)
+
+    @classmethod
+    def from_files(
+        cls,
+        fp_a: BinaryIO,
+        fp_b: BinaryIO,
+        delim_mode: str = "auto",
+        custom_delim: str = "",
+        case_sensitive: bool = False,
+        strip_items: bool = True,
+        out_dir: Optional[str] = None,
+        run_size: int = DEFAULT_RUN_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        pipeline: Optional[Pipeline] = None,
+        workers: int = 1,
+    ) -> "ExternalComparison":
+        options = (delim_mode, custom_delim, case_sensitive, strip_items, chunk_size, pipeline)
+        return cls(
+            iter_file_pairs(fp_a, *options), iter_file_pairs(fp_b, *options),
+            out_dir, run_size, workers,
+        )
+
+    def region_path(self, region: str, sort: bool = False) -> str:
+        return os.path.join(self.out_dir, f"{region}.sorted.pkl" if sort else f"{region}.pkl")
+
+    def _write_sorted_region(self, region: str):
+        # Written under a temporary name, so concurrent readers only ever
+        # see a complete file.
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.out_dir)
+        with tempfile.TemporaryDirectory(dir=self.out_dir) as spill_dir, os.fdopen(fd, "wb") as f:
+            items = _read_batches(self.region_path(region))
+            _write_batches(iter_sorted(items, spill_dir, self.run_size), f)
+        os.replace(tmp, self.region_path(region, sort=True))
+
+    def iter_region(self, region: str, sort: bool = False) -> Iterator[str]:
+        if sort and not os.path.exists(self.region_path(region, sort=True)):
+            self._write_sorted_region(region)
+        return _read_batches(self.region_path(region, sort))
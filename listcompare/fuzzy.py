@@ -0,0 +1,243 @@
+"""
+Fuzzy matching of near-duplicate items with an inverted trigram index.
+
+Items are compared by the Jaccard similarity of their character trigram
+sets. Grams are ranked rarest first, and only each indexed item's prefix
+of |grams| - ceil(t * |grams|) + 1 grams is put in the inverted index:
+two sets with Jaccard similarity >= t always share a gram within their
+prefixes under a common order, so probing the query's prefix finds every
+match while touching short posting lists. Candidates are then verified
+exactly, so results match an all-pairs comparison.
+"""
+import math
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Hashable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .engine import BaseComparison, ListComparison
+
+
+DEFAULT_FUZZY_THRESHOLD = 0.7
+
+# Tolerance for float products such as 0.7 * 10 landing just above 7.
+_EPS = 1e-9
+
+FuzzyMatch = Tuple[int, int, float]
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Character trigrams of ``text``, padded so short strings and word
+    boundaries at either end still produce grams.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    inter = len(grams_a & grams_b)
+    return inter / (len(grams_a) + len(grams_b) - inter)
+
+
+def _prefix_length(size: int, threshold: float) -> int:
+    return size - math.ceil(threshold * size - _EPS) + 1
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over ``items`` for queries at a fixed
+    similarity threshold.
+
+    Each posting list is split by the gram's position in the indexed
+    item's prefix and sorted by item size. Two sets of sizes n and m need
+    ceil(t / (1 + t) * (n + m)) common grams, which bounds the sizes worth
+    reading for every (query position, item position) pair; those size
+    ranges are cut out of the sorted postings by bisection.
+    """
+
+    def __init__(self, items: Sequence[str], threshold: float = DEFAULT_FUZZY_THRESHOLD):
+        if not 0 < threshold <= 1:
+            raise ValueError("Fuzzy threshold must be in (0, 1]")
+        self.items = items
+        self.threshold = threshold
+
+        gram_sets = [trigrams(item) for item in items]
+        freq = Counter(g for grams in gram_sets for g in grams)
+        # Rarest first, so prefixes hold the most selective grams.
+        self._rank: Dict[str, int] = {
+            g: r for r, g in enumerate(sorted(freq, key=lambda g: (freq[g], g)))
+        }
+        self._grams: List[FrozenSet[int]] = [frozenset()] * len(items)
+        postings: Dict[int, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for i in sorted(range(len(items)), key=lambda i: len(gram_sets[i])):
+            ranks = sorted(self._rank[g] for g in gram_sets[i])
+            self._grams[i] = frozenset(ranks)
+            for pos, r in enumerate(ranks[:_prefix_length(len(ranks), threshold)]):
+                postings[r][pos].append(i)
+        self._postings: Dict[int, List[Tuple[int, List[int], List[int]]]] = {
+            r: [
+                (pos, ids, [len(self._grams[i]) for i in ids])
+                for pos, ids in sorted(by_pos.items())
+            ]
+            for r, by_pos in postings.items()
+        }
+
+    def query(self, text: str) -> List[Tuple[int, float]]:
+        """
+        (item index, similarity) of every item at or above the threshold.
+        """
+        grams = trigrams(text)
+        n = len(grams)
+        t = self.threshold
+        # Grams the index has never seen rank before all others; they match
+        # nothing but still count towards the query's size.
+        ranks = sorted(self._rank.get(g, -1) for g in grams)
+        known = frozenset(ranks)
+        lo, hi = t * n - _EPS, n / t + _EPS
+
+        candidates: Set[int] = set()
+        for query_pos, r in enumerate(ranks[:_prefix_length(n, t)]):
+            # A first common gram this late in the query leaves room only
+            # for items up to this size, and an item whose first common gram
+            # sits at item_pos must be at least min_size.
+            max_size = min(hi, (n - query_pos) * (1 + t) / t - n + _EPS)
+            for item_pos, ids, sizes in self._postings.get(r, ()):
+                min_size = max(lo, t * n + item_pos * (1 + t) - _EPS)
+                candidates.update(ids[bisect_left(sizes, min_size):bisect_right(sizes, max_size)])
+
+        matches = []
+        for i in candidates:
+            candidate = self._grams[i]
+            m = len(candidate)
+            inter = len(known & candidate)
+            score = inter / (n + m - inter)
+            if score >= t - _EPS:
+                matches.append((i, score))
+        return matches
+
+    def best_match(self, text: str) -> Tuple[int, float]:
+        """
+        Most similar item as (index, similarity), or (-1, 0.0) if none
+        reaches the threshold. Ties go to the earliest item.
+        """
+        return max(self.query(text), key=lambda m: (m[1], -m[0]), default=(-1, 0.0))
+
+
+def fuzzy_join(
+    items_a: Sequence[str],
+    items_b: Sequence[str],
+    threshold: float = DEFAULT_FUZZY_THRESHOLD,
+) -> List[FuzzyMatch]:
+    """
+    Pairs every item of A with its most similar item of B at or above
+    ``threshold``, as (index in A, index in B, similarity). B is indexed;
+    an item of B may be the best match of several items of A.
+    """
+    index = TrigramIndex(items_b, threshold)
+    matches = []
+    for i, text in enumerate(items_a):
+        j, score = index.best_match(text)
+        if j >= 0:
+            matches.append((i, j, score))
+    return matches
+
+
+class FuzzyComparison(BaseComparison):
+    """
+    Exact comparison plus a "fuzzy" region pairing the one-sided items that
+    are near-duplicates.
+
+    Each A-only item is matched to its most similar B-only item (trigram
+    similarity of the case-folded originals), so only the unmatched
+    residue of the exact comparison is indexed. Matched items leave the
+    one-sided regions; Jaccard and overlap remain those of the exact
+    comparison.
+    """
+
+    FUZZY_COLUMNS = ("A item", "B item", "Similarity")
+
+    def __init__(self, base: ListComparison, threshold: float = DEFAULT_FUZZY_THRESHOLD):
+        self.threshold = threshold
+        self._pair_one_sided(base)
+
+    def _join(self, items_a: List[str], items_b: List[str]) -> List[FuzzyMatch]:
+        """
+        (index in A, index in B, score) of the pairs to report; subclasses
+        swap in other matchers.
+        """
+        return fuzzy_join(items_a, items_b, self.threshold)
+
+    def _pair_one_sided(self, base: ListComparison):
+        self.base = base
+        keys_a = base.region_keys("A_only")
+        keys_b = base.region_keys("B_only")
+        matches = self._join(
+            [base.norm_map_a[k].casefold() for k in keys_a],
+            [base.norm_map_b[k].casefold() for k in keys_b],
+        )
+        self.matches: List[Tuple[Hashable, Hashable, float]] = [
+            (keys_a[i], keys_b[j], score) for i, j, score in matches
+        ]
+        self._matched = {
+            "A_only": {a for a, _, _ in self.matches},
+            "B_only": {b for _, b, _ in self.matches},
+        }
+        self._region_keys: Dict[Tuple[str, bool], List[Hashable]] = {}
+        self._rows: Dict[bool, List[Tuple[str, str, float]]] = {}
+
+    def region_columns(self, region: str) -> Tuple[str, ...]:
+        return self.FUZZY_COLUMNS if region == "fuzzy" else self.base.region_columns(region)
+
+    def region_keys(self, region: str, sort: bool = False) -> List[Hashable]:
+        if region not in self._matched:
+            return self.base.region_keys(region, sort)
+        cache_key = (region, sort)
+        keys = self._region_keys.get(cache_key)
+        if keys is None:
+            matched = self._matched[region]
+            keys = [k for k in self.base.region_keys(region, sort) if k not in matched]
+            self._region_keys[cache_key] = keys
+        return keys
+
+    def _fuzzy_rows(self, sort: bool) -> List[Tuple[str, str, float]]:
+        rows = self._rows.get(sort)
+        if rows is None:
+            map_a, map_b = self.base.norm_map_a, self.base.norm_map_b
+            rows = [(map_a[a], map_b[b], round(score, 3)) for a, b, score in self.matches]
+            if sort:
+                rows.sort()
+            self._rows[sort] = rows
+        return rows
+
+    def iter_region(self, region: str, sort: bool = False) -> Iterator:
+        if region == "fuzzy":
+            return iter(self._fuzzy_rows(sort))
+        if region not in self._matched:
+            return self.base.iter_region(region, sort)
+        mapping = self.base._region_map(region)
+        return (mapping[k] for k in self.region_keys(region, sort))
+
+    def page(self, region: str, start: int, stop: Optional[int], sort: bool = False) -> List:
+        if region == "fuzzy":
+            return self._fuzzy_rows(sort)[start:stop]
+        if region not in self._matched:
+            return self.base.page(region, start, stop, sort)
+        mapping = self.base._region_map(region)
+        return [mapping[k] for k in self.region_keys(region, sort)[start:stop]]
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        counts = dict(self.base.counts)
+        counts["A_only"] -= len(self._matched["A_only"])
+        counts["B_only"] -= len(self._matched["B_only"])
+        counts["fuzzy"] = len(self.matches)
+        return counts
+
+    @property
+    def jaccard(self) -> float:
+        return self.base.jaccard
+
+    @property
+    def overlap(self) -> float:
+        return self.base.overlap
@@ -0,0 +1,254 @@
+"""
+On-disk index of a reference list's norm map for repeated comparisons.
+
+The file holds the normalized keys in sorted (UTF-8 byte) order together
+with their first-seen originals, addressed by an offsets table, and the
+record numbers in order of the originals for sorted output. Composite
+keys, which are digests rather than strings, are stored as raw bytes. It is
+opened with mmap, so loading costs a header read regardless of size;
+lookups are binary searches over the offsets.
+
+Layout (little-endian):
+
+    magic            8 bytes   b"LCINDEX2"
+    meta length      u64
+    meta             JSON      parsing options and item count
+    offsets          u64 * (2 * count + 1)
+    order            u64 * count
+    data             key 0, original 0, key 1, original 1, ...
+
+Record i's key spans offsets[2i]:offsets[2i + 1] and its original
+offsets[2i + 1]:offsets[2i + 2], relative to the start of the data block.
+LCINDEX1 files, written before the order table, are still read.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from functools import cached_property
+from operator import itemgetter
+from typing import Dict, Hashable, Iterator, List, Mapping, Optional, Tuple
+
+from .engine import BaseComparison
+
+
+_MAGIC = b"LCINDEX2"
+_MAGIC_V1 = b"LCINDEX1"  # no order table
+_U64 = struct.Struct("<Q")
+
+
+def _encode_key(key: Hashable) -> bytes:
+    return key if isinstance(key, bytes) else key.encode("utf-8", "surrogatepass")
+
+
+def write_index(norm_map: Mapping[Hashable, str], path: str, options: Optional[Dict] = None):
+    """
+    Writes a norm map to ``path`` as a sorted, memory-mappable index.
+    """
+    records = sorted(
+        (_encode_key(norm), raw.encode("utf-8", "surrogatepass"))
+        for norm, raw in norm_map.items()
+    )
+    binary_keys = any(isinstance(norm, bytes) for norm in norm_map)
+    meta = json.dumps(
+        {"count": len(records), "binary_keys": binary_keys, "options": options or {}}
+    ).encode("utf-8")
+
+    offsets = array("Q", [0])
+    pos = 0
+    for key, raw in records:
+        pos += len(key)
+        offsets.append(pos)
+        pos += len(raw)
+        offsets.append(pos)
+    # Record numbers by original, so sorted output streams from the file.
+    order = array("Q", sorted(
+        range(len(records)), key=lambda i: records[i][1].decode("utf-8", "surrogatepass")
+    ))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+        order.byteswap()
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC)
+        f.write(_U64.pack(len(meta)))
+        f.write(meta)
+        f.write(offsets.tobytes())
+        f.write(order.tobytes())
+        for key, raw in records:
+            f.write(key)
+            f.write(raw)
+    os.replace(tmp, path)
+
+
+class ReferenceIndex:
+    """
+    Read-only, memory-mapped view of an index written by write_index.
+
+    Behaves like a normalized value -> original mapping for lookups and
+    iterates keys in sorted order.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if sys.byteorder != "little":
+            raise RuntimeError("list indexes can only be memory-mapped on little-endian platforms")
+        with open(path, "rb") as f:
+            magic = f.read(len(_MAGIC))
+            if magic not in (_MAGIC, _MAGIC_V1):
+                raise ValueError(f"{path} is not a list index")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        pos = len(_MAGIC)
+        (meta_len,) = _U64.unpack_from(self._mm, pos)
+        pos += _U64.size
+        self.meta = json.loads(bytes(self._mm[pos:pos + meta_len]))
+        pos += meta_len
+
+        self._count = self.meta["count"]
+        self.binary_keys = self.meta.get("binary_keys", False)
+        table_len = 8 * (2 * self._count + 1)
+        self._view = memoryview(self._mm)
+        self._offsets = self._view[pos:pos + table_len].cast("Q")
+        pos += table_len
+        self._order = None
+        if magic == _MAGIC:
+            self._order = self._view[pos:pos + 8 * self._count].cast("Q")
+            pos += 8 * self._count
+        self._data_start = pos
+
+    @property
+    def options(self) -> Dict:
+        return self.meta["options"]
+
+    def close(self):
+        # Views must be released before the map can be closed.
+        self._offsets.release()
+        if self._order is not None:
+            self._order.release()
+        self._view.release()
+        self._mm.close()
+
+    def __enter__(self) -> "ReferenceIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Record access
+    def _key_bytes(self, i: int) -> bytes:
+        start = self._data_start
+        return self._mm[start + self._offsets[2 * i]:start + self._offsets[2 * i + 1]]
+
+    def _raw_bytes(self, i: int) -> bytes:
+        start = self._data_start
+        return self._mm[start + self._offsets[2 * i + 1]:start + self._offsets[2 * i + 2]]
+
+    def _key(self, i: int) -> Hashable:
+        key = self._key_bytes(i)
+        return key if self.binary_keys else key.decode("utf-8", "surrogatepass")
+
+    def _find(self, key: Hashable) -> int:
+        target = _encode_key(key)
+        i = bisect_left(_KeyView(self), target)
+        if i < self._count and self._key_bytes(i) == target:
+            return i
+        return -1
+
+    # Mapping-like interface
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._find(key) >= 0
+
+    def __getitem__(self, key: Hashable) -> str:
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._raw_bytes(i).decode("utf-8", "surrogatepass")
+
+    def get(self, key: Hashable, default: Optional[str] = None) -> Optional[str]:
+        i = self._find(key)
+        return default if i < 0 else self._raw_bytes(i).decode("utf-8", "surrogatepass")
+
+    def __iter__(self) -> Iterator[Hashable]:
+        for i in range(self._count):
+            yield self._key(i)
+
+    def items(self, sort: bool = False) -> Iterator[Tuple[Hashable, str]]:
+        """
+        (key, original) pairs in key order or, with ``sort``, in order of
+        the originals.
+        """
+        if sort and self._order is None:
+            # An LCINDEX1 file has no order table to stream from.
+            yield from sorted(self.items(), key=itemgetter(1))
+            return
+        for i in self._order if sort else range(self._count):
+            yield self._key(i), self._raw_bytes(i).decode("utf-8", "surrogatepass")
+
+
+class _KeyView:
+    # Sequence of raw key bytes, so bisect can search without decoding.
+    def __init__(self, index: ReferenceIndex):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._index._key_bytes(i)
+
+
+class IndexComparison(BaseComparison):
+    """
+    Comparison of a saved reference index A against an in-memory list B.
+
+    Only B's keys are looked up, so the work is O(|B| log |A|) and A is
+    never loaded. A-only items are streamed from the index on demand.
+    """
+
+    def __init__(self, index: ReferenceIndex, norm_map_b: Dict[Hashable, str]):
+        self.index = index
+        self.norm_map_b = norm_map_b
+
+    @cached_property
+    def inter_map(self) -> Dict[Hashable, str]:
+        inter = {}
+        for norm in self.norm_map_b:
+            raw = self.index.get(norm)
+            if raw is not None:
+                inter[norm] = raw
+        return inter
+
+    @property
+    def intersection(self) -> List[str]:
+        return list(self.inter_map.values())
+
+    @property
+    def B_only(self) -> List[str]:
+        return [raw for n, raw in self.norm_map_b.items() if n not in self.inter_map]
+
+    @property
+    def A_only(self) -> List[str]:
+        return list(self.iter_region("A_only"))
+
+    def iter_region(self, region: str, sort: bool = False) -> Iterator[str]:
+        if region != "A_only":
+            return super().iter_region(region, sort)
+        inter = self.inter_map
+        return (raw for norm, raw in self.index.items(sort) if norm not in inter)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        inter = len(self.inter_map)
+        return {
+            "A_only": len(self.index) - inter,
+            "intersection": inter,
+            "B_only": len(self.norm_map_b) - inter,
+        }
@@ -0,0 +1,107 @@
+"""
+Similar-pair search among many lists with MinHash and LSH banding.
+
+Each signature is cut into ``bands`` bands of ``rows`` values. Two lists
+become a candidate pair when any band matches exactly, which happens with
+probability 1 - (1 - J**rows)**bands for Jaccard similarity J. Only
+candidates are scored, so a catalog of n lists needs far fewer than
+n(n - 1) / 2 comparisons when few pairs are similar.
+"""
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .sketches import MinHash
+
+
+DEFAULT_THRESHOLD = 0.5
+
+SimilarPair = Tuple[int, int, float]
+
+
+def band_threshold(bands: int, rows: int) -> float:
+    """
+    Similarity at which a pair becomes a candidate with probability ~1/2.
+    """
+    return (1 / bands) ** (1 / rows)
+
+
+def candidate_probability(jaccard: float, bands: int, rows: int) -> float:
+    return 1 - (1 - jaccard ** rows) ** bands
+
+
+def choose_bands(k: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) for signatures of length ``k``: the most rows per band
+    whose band threshold is still at or below ``threshold``, so pairs at
+    the threshold are rarely missed. Leftover signature values are unused.
+    """
+    best = (k, 1)
+    for rows in range(1, k + 1):
+        bands = k // rows
+        if band_threshold(bands, rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def candidate_pairs(signatures: Sequence[Sequence[int]], bands: int, rows: int) -> Set[Tuple[int, int]]:
+    """
+    Index pairs (i < j) that share at least one band.
+    """
+    candidates: Set[Tuple[int, int]] = set()
+    for band in range(bands):
+        lo = band * rows
+        buckets: Dict[Tuple[int, ...], List[int]] = defaultdict(list)
+        for i, sig in enumerate(signatures):
+            buckets[tuple(sig[lo:lo + rows])].append(i)
+        for members in buckets.values():
+            if len(members) > 1:
+                candidates.update(combinations(members, 2))
+    return candidates
+
+
+def similar_pairs(
+    sketches: Sequence[MinHash],
+    threshold: float = DEFAULT_THRESHOLD,
+    bands: Optional[int] = None,
+    rows: Optional[int] = None,
+) -> Tuple[List[SimilarPair], int]:
+    """
+    Pairs of sketches with estimated Jaccard similarity >= ``threshold``,
+    most similar first, and the number of candidate pairs scored.
+
+    Empty sketches are never paired. Bands default to choose_bands.
+    """
+    if not sketches:
+        return [], 0
+    k = sketches[0].k
+    if any(s.k != k for s in sketches):
+        raise ValueError("Cannot compare MinHash sketches with different k")
+    if bands is None or rows is None:
+        bands, rows = choose_bands(k, threshold)
+
+    indexes = [i for i, s in enumerate(sketches) if not s.is_empty]
+    signatures = [sketches[i].signature() for i in indexes]
+
+    pairs = []
+    candidates = candidate_pairs(signatures, bands, rows)
+    for a, b in candidates:
+        sig_a, sig_b = signatures[a], signatures[b]
+        estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / k
+        if estimate >= threshold:
+            pairs.append((indexes[a], indexes[b], estimate))
+    pairs.sort(key=lambda p: (-p[2], p[0], p[1]))
+    return pairs, len(candidates)
+
+
+def similarity_matrix(n: int, pairs: Sequence[SimilarPair]) -> List[List[Optional[float]]]:
+    """
+    n x n matrix with 1.0 on the diagonal and the given pair estimates;
+    pairs that were not found similar are None.
+    """
+    matrix: List[List[Optional[float]]] = [[None] * n for _ in range(n)]
+    for i in range(n):
+        matrix[i][i] = 1.0
+    for i, j, estimate in pairs:
+        matrix[i][j] = matrix[j][i] = estimate
+    return matrix
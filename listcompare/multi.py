@@ -0,0 +1,127 @@
+"""
+N-way comparison of several lists by membership bitmask.
+
+One pass over the (normalized, original) pairs of all lists assigns each
+normalized key a bitmask with bit i set if list i contains it. Every Venn
+region is then the set of keys with one exact mask, so all 2**N - 1
+regions are counted from a single dictionary without any set algebra.
+"""
+from collections import Counter
+from functools import cached_property
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+MAX_LISTS = 16
+
+Pair = Tuple[Hashable, str]
+
+
+def mask_members(mask: int) -> List[int]:
+    """
+    Indexes of the lists in a membership mask.
+    """
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+
+def region_label(mask: int, labels: Sequence[str]) -> str:
+    """
+    Human-readable region name, e.g. "A ∩ C only", or "All lists".
+    """
+    if mask == (1 << len(labels)) - 1:
+        return "All lists"
+    names = " ∩ ".join(labels[i] for i in mask_members(mask))
+    return f"{names} only"
+
+
+class MultiComparison:
+    """
+    Venn regions of N lists, addressed by membership mask.
+
+    Only one mask and one original per distinct key are kept, whatever the
+    number of lists; the original is the first seen in the earliest list
+    containing the key. Regions are materialized only when paged or
+    streamed, and cached per (mask, sort).
+    """
+
+    def __init__(self, pair_streams: Iterable[Iterable[Pair]]):
+        masks: Dict[Hashable, int] = {}
+        originals: Dict[Hashable, str] = {}
+        n = 0
+        for i, pairs in enumerate(pair_streams):
+            if i >= MAX_LISTS:
+                raise ValueError(f"At most {MAX_LISTS} lists can be compared at once")
+            bit = 1 << i
+            for norm, raw in pairs:
+                mask = masks.get(norm)
+                if mask is None:
+                    masks[norm] = bit
+                    originals[norm] = raw
+                elif not mask & bit:
+                    masks[norm] = mask | bit
+            n = i + 1
+        self.n = n
+        self.masks = masks
+        self.originals = originals
+        self._region_keys: Dict[Tuple[int, bool], List[Hashable]] = {}
+
+    @classmethod
+    def from_norm_maps(cls, norm_maps: Sequence[Dict[Hashable, str]]) -> "MultiComparison":
+        return cls(m.items() for m in norm_maps)
+
+    # Summary
+    @cached_property
+    def counts(self) -> Dict[int, int]:
+        """
+        Region size per non-empty mask.
+        """
+        return dict(Counter(self.masks.values()))
+
+    @cached_property
+    def sizes(self) -> List[int]:
+        """
+        Distinct items per list.
+        """
+        sizes = [0] * self.n
+        for mask, count in self.counts.items():
+            for i in mask_members(mask):
+                sizes[i] += count
+        return sizes
+
+    def count_containing(self, mask: int) -> int:
+        """
+        Number of items in at least all the lists of ``mask``.
+        """
+        return sum(count for m, count in self.counts.items() if m & mask == mask)
+
+    @property
+    def union_size(self) -> int:
+        return len(self.masks)
+
+    # Regions
+    def region_columns(self, mask: int) -> Tuple[str, ...]:
+        return ("Item",)
+
+    def region_keys(self, mask: int, sort: bool = False) -> List[Hashable]:
+        """
+        Normalized keys of one exact region, cached per (mask, sort).
+        """
+        cache_key = (mask, sort)
+        keys = self._region_keys.get(cache_key)
+        if keys is None:
+            keys = [k for k, m in self.masks.items() if m == mask]
+            if sort:
+                keys.sort(key=self.originals.__getitem__)
+            self._region_keys[cache_key] = keys
+        return keys
+
+    def iter_region(self, mask: int, sort: bool = False) -> Iterator[str]:
+        originals = self.originals
+        if not sort and (mask, False) not in self._region_keys:
+            # Stream straight from the masks without building a key list.
+            return (originals[k] for k, m in self.masks.items() if m == mask)
+        return (originals[k] for k in self.region_keys(mask, sort))
+
+    def page(self, mask: int, start: int, stop: Optional[int], sort: bool = False) -> List[str]:
+        originals = self.originals
+        # Only the requested slice is mapped back to originals.
+        return [originals[k] for k in self.region_keys(mask, sort)[start:stop]]
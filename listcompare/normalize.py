@@ -0,0 +1,166 @@
+"""
+Configurable key normalization, compiled once into bulk functions.
+
+A Pipeline is an ordered tuple of stages applied to each item's key after
+trimming and before case folding:
+
+    nfkc                 Unicode NFKC (compatibility) normalization
+    strip_accents        drop combining marks after NFD decomposition
+    collapse_whitespace  trim and turn every whitespace run into one space
+    remove_punctuation   drop everything but letters, digits and whitespace
+    strip_leading_zeros  "007" -> "7" at the start of the key only, so
+                         "SKU-007" and "2024-01-05" are unchanged; "0" and
+                         "0.5" are kept
+    ("regex", p, r)      re.sub(p, r, key), ignoring case unless the
+                         comparison is case sensitive
+
+Every stage is a short chain of C-implemented callables (str methods,
+unicodedata.normalize and precompiled pattern.sub), so a batch of items
+is normalized by nesting map() over it, with no per-item Python loop.
+Pipelines are plain tuples: hashable for caches and JSON-serializable for
+saved indexes.
+"""
+import re
+import unicodedata
+from functools import partial
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+NORMALIZATION_STAGES = (
+    "nfkc",
+    "strip_accents",
+    "collapse_whitespace",
+    "remove_punctuation",
+    "strip_leading_zeros",
+    "regex",
+)
+
+# Items normalized per bulk call when streaming.
+BATCH_ITEMS = 10_000
+
+_COMBINING_MARKS = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+_PUNCTUATION = re.compile(r"[^\w\s]|_")
+_LEADING_ZEROS = re.compile(r"\A0+(?=\d)")
+
+_STAGE_FUNCTIONS = {
+    "nfkc": (partial(unicodedata.normalize, "NFKC"),),
+    "strip_accents": (partial(unicodedata.normalize, "NFD"), partial(_COMBINING_MARKS.sub, "")),
+    "collapse_whitespace": (str.split, " ".join),
+    "remove_punctuation": (partial(_PUNCTUATION.sub, ""),),
+    "strip_leading_zeros": (partial(_LEADING_ZEROS.sub, ""),),
+}
+
+Stage = Union[str, Sequence[str]]
+KeyFunction = Callable[[Iterable[str]], Iterable[str]]
+
+
+class Pipeline(tuple):
+    """
+    Ordered normalization stages, each a name from NORMALIZATION_STAGES or
+    ("regex", pattern, replacement). Stages are validated, and patterns
+    compiled, on construction.
+    """
+
+    def __new__(cls, stages: Iterable[Stage] = ()):
+        specs = []
+        for stage in stages:
+            spec = (stage,) if isinstance(stage, str) else tuple(stage)
+            name = spec[0] if spec else None
+            if name not in NORMALIZATION_STAGES:
+                raise ValueError(f"Unknown normalization stage: {name!r}")
+            if name == "regex":
+                if len(spec) != 3:
+                    raise ValueError("A regex stage is (\"regex\", pattern, replacement)")
+                re.compile(spec[1])
+            elif len(spec) != 1:
+                raise ValueError(f"Stage {name!r} takes no arguments")
+            specs.append(spec)
+        return super().__new__(cls, specs)
+
+    def functions(self, ignore_case: bool = False) -> List[Callable[[str], object]]:
+        """
+        The pipeline as a flat chain of single-argument callables. With
+        ``ignore_case``, regex stages match regardless of case, since the
+        keys are only case-folded after them.
+        """
+        chain: List[Callable[[str], object]] = []
+        flags = re.IGNORECASE if ignore_case else 0
+        for name, *args in self:
+            if name == "regex":
+                pattern, replacement = args
+                chain.append(partial(re.compile(pattern, flags).sub, replacement))
+            else:
+                chain.extend(_STAGE_FUNCTIONS[name])
+        return chain
+
+
+def _key_chain(case_sensitive: bool, pipeline: Optional[Pipeline]) -> List[Callable]:
+    chain = pipeline.functions(not case_sensitive) if pipeline else []
+    if not case_sensitive:
+        chain.append(str.casefold)
+    return chain
+
+
+def compile_key(case_sensitive: bool, pipeline: Optional[Pipeline] = None) -> Callable[[str], str]:
+    """
+    Single-item key function: the pipeline's stages, then case folding.
+    """
+    chain = _key_chain(case_sensitive, pipeline)
+    if not chain:
+        return str
+    if len(chain) == 1:
+        return chain[0]
+
+    def key(item: str) -> str:
+        for f in chain:
+            item = f(item)
+        return item
+
+    return key
+
+
+def compile_keys(case_sensitive: bool, pipeline: Optional[Pipeline] = None) -> KeyFunction:
+    """
+    Bulk key function mapping an iterable of items to their keys, built
+    from nested map() calls.
+    """
+    chain = _key_chain(case_sensitive, pipeline)
+
+    def keys(items: Iterable[str]) -> Iterable[str]:
+        for f in chain:
+            items = map(f, items)
+        return items
+
+    return keys
+
+
+def compile_normalizer(
+    case_sensitive: bool,
+    strip_items: bool,
+    pipeline: Optional[Pipeline] = None,
+) -> Callable[[Sequence[str]], Iterator[Tuple[str, str]]]:
+    """
+    Returns a function turning a batch of parts into (key, item) pairs.
+
+    Items are the parts, trimmed if ``strip_items``; keys are the items
+    run through the pipeline and case folding. Parts whose key is empty
+    are dropped.
+    """
+    keys = compile_keys(case_sensitive, pipeline)
+
+    def normalize(parts: Sequence[str]) -> Iterator[Tuple[str, str]]:
+        items = list(map(str.strip, parts)) if strip_items else parts
+        return filter(itemgetter(0), zip(keys(items), items))
+
+    return normalize
+
+
+def iter_batches(parts: Iterable[str], size: int = BATCH_ITEMS) -> Iterator[List[str]]:
+    parts = iter(parts)
+    while True:
+        batch = list(islice(parts, size))
+        if not batch:
+            return
+        yield batch
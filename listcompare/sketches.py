@@ -0,0 +1,264 @@
+"""
+Fixed-size sketches for approximate similarity and counts on inputs too
+large to materialize.
+
+Keys are hashed with an unkeyed 64-bit blake2b digest so sketches are
+stable across processes and runs.
+"""
+import math
+from functools import cached_property
+from hashlib import blake2b
+from typing import BinaryIO, Dict, Hashable, Iterable, List, Optional
+
+from .engine import REGIONS, BaseComparison
+from .normalize import Pipeline
+from .streaming import DEFAULT_CHUNK_SIZE, iter_file_pairs
+
+
+DEFAULT_MINHASH_K = 256
+
+_EMPTY = 1 << 64  # larger than any bin value
+
+
+def hash64(key: Hashable) -> int:
+    """
+    Stable 64-bit hash of a normalized key (str or bytes).
+    """
+    data = key.encode("utf-8", "surrogatepass") if isinstance(key, str) else bytes(key)
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
+
+
+def iter_file_keys(
+    fp: BinaryIO,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pipeline: Optional[Pipeline] = None,
+) -> Iterable[str]:
+    """
+    Streams the normalized keys of a file, duplicates included.
+    """
+    pairs = iter_file_pairs(
+        fp, delim_mode, custom_delim, case_sensitive, strip_items, chunk_size, pipeline
+    )
+    return (norm for norm, _ in pairs)
+
+
+# -----------------------------
+# MinHash
+# -----------------------------
+class MinHash:
+    """
+    One-permutation MinHash: each key is hashed once, the hash picks one of
+    ``k`` bins and the bin keeps its minimum. Empty bins are filled by
+    rotation when the signature is taken, so signatures of small sets stay
+    comparable.
+
+    The Jaccard estimate has a standard error of about sqrt(J(1 - J) / k).
+    """
+
+    def __init__(self, k: int = DEFAULT_MINHASH_K):
+        self.k = k
+        self.bins: List[int] = [_EMPTY] * k
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[Hashable], k: int = DEFAULT_MINHASH_K) -> "MinHash":
+        sketch = cls(k)
+        sketch.update_many(keys)
+        return sketch
+
+    def update(self, key: Hashable):
+        v, b = divmod(hash64(key), self.k)
+        if v < self.bins[b]:
+            self.bins[b] = v
+
+    def update_many(self, keys: Iterable[Hashable]):
+        k = self.k
+        bins = self.bins
+        for key in keys:
+            v, b = divmod(hash64(key), k)
+            if v < bins[b]:
+                bins[b] = v
+
+    def merge(self, other: "MinHash") -> "MinHash":
+        """
+        Sketch of the union of both inputs.
+        """
+        if other.k != self.k:
+            raise ValueError("Cannot merge MinHash sketches with different k")
+        merged = MinHash(self.k)
+        merged.bins = [min(a, b) for a, b in zip(self.bins, other.bins)]
+        return merged
+
+    @property
+    def is_empty(self) -> bool:
+        return all(v == _EMPTY for v in self.bins)
+
+    def signature(self) -> List[int]:
+        """
+        Densified bin values: an empty bin borrows the next non-empty bin's
+        value, offset by the distance so borrowed values stay distinguishable.
+        """
+        k = self.k
+        bins = self.bins
+        if self.is_empty:
+            return list(bins)
+        sig = list(bins)
+        for i in range(k):
+            if bins[i] == _EMPTY:
+                t = 1
+                while bins[(i + t) % k] == _EMPTY:
+                    t += 1
+                sig[i] = bins[(i + t) % k] + t * _EMPTY
+        return sig
+
+    def jaccard(self, other: "MinHash") -> float:
+        if other.k != self.k:
+            raise ValueError("Cannot compare MinHash sketches with different k")
+        if self.is_empty or other.is_empty:
+            return 0.0
+        matches = sum(a == b for a, b in zip(self.signature(), other.signature()))
+        return matches / self.k
+
+
+def jaccard_error_bound(estimate: float, k: int, z: float = 1.96) -> float:
+    """
+    Half-width of the ~95% confidence interval of a MinHash Jaccard estimate.
+    """
+    # Keep the bound non-zero at the extremes, where J(1 - J) collapses.
+    j = min(max(estimate, 1 / k), 1 - 1 / k)
+    return z * math.sqrt(j * (1 - j) / k)
+
+
+def minhash_from_file(
+    fp: BinaryIO,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    k: int = DEFAULT_MINHASH_K,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pipeline: Optional[Pipeline] = None,
+) -> MinHash:
+    """
+    Sketches a file in one streaming pass, holding only k bins in memory.
+    """
+    keys = iter_file_keys(
+        fp, delim_mode, custom_delim, case_sensitive, strip_items, chunk_size, pipeline
+    )
+    return MinHash.from_keys(keys, k)
+
+
+# -----------------------------
+# HyperLogLog
+# -----------------------------
+DEFAULT_HLL_PRECISION = 14
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch with 2**p one-byte registers.
+
+    The relative standard error is about 1.04 / sqrt(2**p), 0.8% at p=14.
+    """
+
+    def __init__(self, p: int = DEFAULT_HLL_PRECISION):
+        if not 4 <= p <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[Hashable], p: int = DEFAULT_HLL_PRECISION) -> "HyperLogLog":
+        sketch = cls(p)
+        sketch.update_many(keys)
+        return sketch
+
+    def update(self, key: Hashable):
+        self.update_many((key,))
+
+    def update_many(self, keys: Iterable[Hashable]):
+        p = self.p
+        q = 64 - p
+        mask = (1 << q) - 1
+        registers = self.registers
+        for key in keys:
+            h = hash64(key)
+            idx = h >> q
+            rank = q - (h & mask).bit_length() + 1
+            if rank > registers[idx]:
+                registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Sketch of the union of both inputs.
+        """
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        merged = HyperLogLog(self.p)
+        merged.registers = bytearray(map(max, self.registers, other.registers))
+        return merged
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def cardinality(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            return m * math.log(m / zeros)
+        return estimate
+
+
+def hll_from_file(
+    fp: BinaryIO,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    p: int = DEFAULT_HLL_PRECISION,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pipeline: Optional[Pipeline] = None,
+) -> HyperLogLog:
+    """
+    Sketches a file in one streaming pass, holding only 2**p registers.
+    """
+    keys = iter_file_keys(
+        fp, delim_mode, custom_delim, case_sensitive, strip_items, chunk_size, pipeline
+    )
+    return HyperLogLog.from_keys(keys, p)
+
+
+class EstimatedComparison(BaseComparison):
+    """
+    Approximate region counts from HyperLogLog sketches of A, B and A ∪ B.
+
+    The intersection is |A| + |B| - |A ∪ B|, so its absolute error is that
+    of the three estimates combined; it can be poor when the overlap is a
+    small fraction of the union. Item lists are not available.
+    """
+
+    approximate_regions = REGIONS
+
+    def __init__(self, sketch_a: HyperLogLog, sketch_b: HyperLogLog):
+        self.sketch_a = sketch_a
+        self.sketch_b = sketch_b
+
+    @cached_property
+    def counts(self) -> Dict[str, int]:
+        size_a = self.sketch_a.cardinality()
+        size_b = self.sketch_b.cardinality()
+        union = self.sketch_a.merge(self.sketch_b).cardinality()
+        union = max(union, size_a, size_b)
+        return {
+            "A_only": round(union - size_b),
+            "intersection": round(max(size_a + size_b - union, 0.0)),
+            "B_only": round(union - size_a),
+        }
@@ -0,0 +1,260 @@
+import bz2
+import gzip
+import io
+import lzma
+import re
+from itertools import chain
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+from .engine import iter_norm_pairs, normalize_items
+from .normalize import Pipeline
+
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # characters per read
+
+# Characters str.splitlines() treats as line boundaries.
+LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE = re.compile(f"[{re.escape(LINE_BREAKS)}]")
+
+
+# Stream headers of the compressed formats accepted as input. bz2's "BZh"
+# is plain ASCII, so its block size digit and the magic of the first block
+# (or of the end of an empty stream) must follow before a list counts as bz2.
+COMPRESSION_MAGIC = (
+    ("gzip", re.compile(rb"\x1f\x8b")),
+    ("bz2", re.compile(rb"BZh[1-9](?:1AY&SY|\x17rE8P\x90)")),
+    ("xz", re.compile(rb"\xfd7zXZ\x00")),
+    ("zstd", re.compile(rb"\x28\xb5\x2f\xfd")),
+)
+_MAGIC_LEN = 10
+
+# Raised while reading corrupt or truncated compressed input.
+DECOMPRESSION_ERRORS: Tuple[type, ...] = (OSError, EOFError, lzma.LZMAError) + (
+    (zstandard.ZstdError,) if zstandard is not None else ()
+)
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+class _PrefixedReader(io.RawIOBase):
+    # Replays already-read bytes ahead of the rest of a non-seekable file.
+    # Closing it leaves the wrapped file open.
+    def __init__(self, prefix: bytes, fp: BinaryIO):
+        self._prefix = prefix
+        self._fp = fp
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._prefix:
+            n = min(len(b), len(self._prefix))
+            b[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        data = self._fp.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+def detect_compression(fp: BinaryIO) -> Tuple[Optional[str], BinaryIO]:
+    """
+    Identifies the compression of a binary file object by its magic bytes.
+
+    Returns the format name (None for plain input) and a file object
+    positioned at the same place as ``fp``. Non-seekable input is wrapped
+    so the peeked bytes are replayed.
+    """
+    if fp.seekable():
+        pos = fp.tell()
+        head = fp.read(_MAGIC_LEN)
+        fp.seek(pos)
+    else:
+        head = fp.read(_MAGIC_LEN)
+        fp = _PrefixedReader(head, fp)
+    for name, magic in COMPRESSION_MAGIC:
+        if magic.match(head):
+            return name, fp
+    return None, fp
+
+
+def open_input(fp: BinaryIO) -> BinaryIO:
+    """
+    Returns a binary file object that yields the decompressed contents of
+    ``fp`` (gzip, bz2, xz or zstd), or ``fp`` itself for plain input.
+
+    Decompression is streamed; closing the returned object leaves ``fp``
+    open.
+    """
+    compression, fp = detect_compression(fp)
+    if compression is None:
+        return fp
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=fp, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(fp, "rb")
+    if compression == "xz":
+        return lzma.LZMAFile(fp, "rb")
+    if zstandard is None:
+        raise RuntimeError("zstd input requires the 'zstandard' package")
+    return zstandard.ZstdDecompressor().stream_reader(fp, read_across_frames=True, closefd=False)
+
+
+def read_chunks(
+    fp: BinaryIO,
+    encoding: str = "utf-8-sig",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Decodes a binary file object into text chunks without reading it whole.
+
+    Compressed input is detected by its magic bytes and decompressed on
+    the fly. Line endings are passed through untranslated so the tokenizer
+    sees the same characters a pasted text would contain.
+    """
+    raw = open_input(fp)
+    reader = io.TextIOWrapper(raw, encoding=encoding, errors="replace", newline="")
+    try:
+        while True:
+            chunk = reader.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        # Leave the caller's file object open.
+        reader.detach()
+        if raw is not fp:
+            raw.close()
+
+
+# -----------------------------
+# Tokenizing
+# -----------------------------
+def _split_lines(chunks: Iterable[str]) -> Iterator[str]:
+    carry = ""
+    for chunk in chunks:
+        buf = carry + chunk
+        parts = buf.splitlines()
+        # A break split across chunks ("\r" | "\n") only yields an empty part,
+        # which parsing drops anyway.
+        carry = parts.pop() if parts and buf[-1] not in LINE_BREAKS else ""
+        yield from parts
+    if carry:
+        yield carry
+
+
+def _split_on(chunks: Iterable[str], delim: str) -> Iterator[str]:
+    carry = ""
+    for chunk in chunks:
+        parts = (carry + chunk).split(delim)
+        carry = parts.pop()
+        yield from parts
+    yield carry
+
+
+def _split_whitespace(chunks: Iterable[str]) -> Iterator[str]:
+    carry = ""
+    for chunk in chunks:
+        buf = carry + chunk
+        parts = buf.split()
+        carry = parts.pop() if parts and not buf[-1].isspace() else ""
+        yield from parts
+    if carry:
+        yield carry
+
+
+def _split_auto(chunks: Iterable[str]) -> Iterator[str]:
+    # Same rule as split_items: newline-separated if the text has more than
+    # one line, otherwise comma-separated. Only the first line is buffered
+    # until that is known.
+    chunks = iter(chunks)
+    head = []
+    seen_break = False
+    for chunk in chunks:
+        head.append(chunk)
+        seen_break = seen_break or _LINE_BREAK_RE.search(chunk) is not None
+        if not seen_break:
+            continue
+        text = "".join(head)
+        head = [text]
+        if len(text.splitlines()) > 1:
+            yield from _split_lines(chain([text], chunks))
+            return
+    yield from "".join(head).split(",")
+
+
+def iter_parts(chunks: Iterable[str], delim_mode: str, custom_delim: str) -> Iterator[str]:
+    """
+    Streaming split_items: yields the parts of the concatenated chunks,
+    including items split across chunk boundaries.
+    """
+    if delim_mode == "newline":
+        return _split_lines(chunks)
+    if delim_mode == "comma":
+        return _split_on(chunks, ",")
+    if delim_mode == "semicolon":
+        return _split_on(chunks, ";")
+    if delim_mode == "whitespace":
+        return _split_whitespace(chunks)
+    if delim_mode == "custom":
+        return _split_on(chunks, custom_delim) if custom_delim else iter(["".join(chunks)])
+    return _split_auto(chunks)
+
+
+# -----------------------------
+# Normalizing
+# -----------------------------
+def norm_map_from_chunks(
+    chunks: Iterable[str],
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    pipeline: Optional[Pipeline] = None,
+) -> Dict[str, str]:
+    """
+    Streaming parse_norm_map: only the normalized -> first-seen map is kept.
+    """
+    parts = iter_parts(chunks, delim_mode, custom_delim)
+    return normalize_items(parts, case_sensitive, strip_items, pipeline)
+
+
+def iter_file_pairs(
+    fp: BinaryIO,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pipeline: Optional[Pipeline] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Streams (normalized, original) pairs of a file, duplicates included.
+    """
+    parts = iter_parts(read_chunks(fp, chunk_size=chunk_size), delim_mode, custom_delim)
+    return iter_norm_pairs(parts, case_sensitive, strip_items, pipeline)
+
+
+def norm_map_from_file(
+    fp: BinaryIO,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+    encoding: str = "utf-8-sig",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pipeline: Optional[Pipeline] = None,
+) -> Dict[str, str]:
+    """
+    Builds the norm map of a binary file object, reading it in chunks.
+    """
+    return norm_map_from_chunks(
+        read_chunks(fp, encoding, chunk_size),
+        delim_mode, custom_delim, case_sensitive, strip_items, pipeline,
+    )
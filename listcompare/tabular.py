@@ -0,0 +1,241 @@
+"""
+Column-aware ingest of CSV, TSV, Parquet and Arrow IPC files.
+
+CSV and TSV rows are parsed with the csv module over a streamed (and, if
+needed, decompressed) text reader, so quoted fields containing delimiters
+or line breaks are handled and the file is never read whole. Parquet and
+Arrow files are read by the columnar module. The key of a row is one
+column or a composite of several; keys feed the same (normalized,
+original) pair pipeline as plain lists.
+
+A single-column key is normalized like a list item. A composite key is
+normalized column by column and stored as a fixed-size digest of the
+normalized fields, so its memory cost stays close to a single column's
+whatever the number and width of the key columns.
+"""
+import csv
+import io
+from hashlib import blake2b
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .engine import iter_norm_pairs, norm_map_from_pairs
+from .normalize import Pipeline, compile_key
+from .streaming import open_input
+
+
+TABLE_DELIMITERS = {"csv": ",", "tsv": "\t"}
+TABLE_FORMATS = ("csv", "tsv", "parquet", "arrow")
+
+# Composite keys are shown as a CSV fragment of their fields, which keeps
+# them readable and unambiguous.
+_COMPOSITE_DIALECT = {"delimiter": ",", "lineterminator": "\n"}
+
+COMPOSITE_DIGEST_SIZE = 16
+
+# A normalization option given once for all key columns or once per column.
+ColumnOption = Union[bool, Sequence[bool]]
+
+
+def iter_rows(fp: BinaryIO, fmt: str, encoding: str = "utf-8-sig") -> Iterator[List[str]]:
+    """
+    Streams the rows of a CSV or TSV binary file object.
+    """
+    if fmt not in TABLE_DELIMITERS:
+        raise ValueError(f"Unknown table format: {fmt!r}")
+    raw = open_input(fp)
+    reader = io.TextIOWrapper(raw, encoding=encoding, errors="replace", newline="")
+    try:
+        yield from csv.reader(reader, delimiter=TABLE_DELIMITERS[fmt])
+    finally:
+        # Leave the caller's file object open.
+        reader.detach()
+        if raw is not fp:
+            raw.close()
+
+
+def read_header(fp: BinaryIO, fmt: str, has_header: bool = True) -> List[str]:
+    """
+    Column names of a table: its first row, or "Column 1", "Column 2", ...
+    when the file has no header. ``fp`` is rewound afterwards.
+
+    Parquet and Arrow files always carry their column names in the schema.
+    """
+    if fmt not in TABLE_DELIMITERS:
+        from .columnar import read_columns
+        return read_columns(fp, fmt)
+    pos = fp.tell()
+    rows = iter_rows(fp, fmt)
+    try:
+        first = next(rows, [])
+    finally:
+        rows.close()
+        fp.seek(pos)
+    if has_header:
+        return first
+    return [f"Column {i + 1}" for i in range(len(first))]
+
+
+def iter_table_rows(fp: BinaryIO, fmt: str, has_header: bool = True) -> Iterator[List[str]]:
+    """
+    Yields every data row of a table with all of its fields.
+    """
+    if fmt not in TABLE_DELIMITERS:
+        from .columnar import iter_column_fields, read_columns
+        columns = range(len(read_columns(fp, fmt)))
+        yield from iter_column_fields(fp, fmt, columns)
+        return
+    rows = iter_rows(fp, fmt)
+    if has_header:
+        next(rows, None)
+    yield from rows
+
+
+def iter_key_fields(
+    fp: BinaryIO,
+    fmt: str,
+    key_columns: Sequence[int],
+    has_header: bool = True,
+) -> Iterator[List[str]]:
+    """
+    Yields the key fields of every row, in ``key_columns`` order.
+
+    Rows too short for a key column are treated as having an empty field
+    there.
+    """
+    if not key_columns:
+        raise ValueError("At least one key column is required")
+    if fmt not in TABLE_DELIMITERS:
+        from .columnar import iter_column_fields
+        yield from iter_column_fields(fp, fmt, key_columns)
+        return
+    rows = iter_rows(fp, fmt)
+    if has_header:
+        next(rows, None)
+    for row in rows:
+        yield [row[c] if c < len(row) else "" for c in key_columns]
+
+
+# -----------------------------
+# Composite keys
+# -----------------------------
+def composite_key(norm_fields: Sequence[str]) -> bytes:
+    """
+    Fixed-size digest of normalized key fields. Fields are length-prefixed,
+    so ("a,b", "c") and ("a", "b,c") never share a key.
+    """
+    data = "".join(f"{len(f)}:{f}" for f in norm_fields)
+    return blake2b(data.encode("utf-8", "surrogatepass"), digest_size=COMPOSITE_DIGEST_SIZE).digest()
+
+
+def _per_column(option: ColumnOption, n: int) -> List[bool]:
+    if isinstance(option, bool):
+        return [option] * n
+    if len(option) != n:
+        raise ValueError(f"Expected {n} per-column options, got {len(option)}")
+    return list(option)
+
+
+def key_normalizer(
+    n: int,
+    case_sensitive: ColumnOption,
+    strip_items: ColumnOption,
+    pipeline: Optional[Pipeline] = None,
+) -> Callable[[Sequence[str]], Optional[Tuple[Hashable, str]]]:
+    """
+    Returns a function mapping a row's ``n`` key fields to (normalized key,
+    original), or to None when every field normalizes to empty.
+
+    One field gives a string key, as for plain lists. Several are trimmed,
+    run through ``pipeline`` and case-folded according to their column's
+    options and give a composite_key digest, with the (trimmed) fields as a
+    CSV fragment for the original.
+    """
+    cases = _per_column(case_sensitive, n)
+    strips = _per_column(strip_items, n)
+
+    if n == 1:
+        (case,), (strip,) = cases, strips
+        key = compile_key(case, pipeline)
+
+        def normalize_single(fields: Sequence[str]) -> Optional[Tuple[Hashable, str]]:
+            item = fields[0].strip() if strip else fields[0]
+            norm = key(item)
+            if not norm:
+                return None
+            return norm, item
+
+        return normalize_single
+
+    keys = [compile_key(case, pipeline) for case in cases]
+    buf = io.StringIO()
+    writer = csv.writer(buf, **_COMPOSITE_DIALECT)
+
+    def normalize_composite(fields: Sequence[str]) -> Optional[Tuple[Hashable, str]]:
+        fields = [f.strip() if strip else f for f, strip in zip(fields, strips)]
+        norm = [key(f) for f, key in zip(fields, keys)]
+        if not any(norm):
+            return None
+        writer.writerow(fields)
+        raw = buf.getvalue()[:-1]
+        buf.seek(0)
+        buf.truncate()
+        return composite_key(norm), raw
+
+    return normalize_composite
+
+
+# -----------------------------
+# Pairs and norm maps
+# -----------------------------
+def iter_table_pairs(
+    fp: BinaryIO,
+    fmt: str,
+    key_columns: Sequence[int],
+    case_sensitive: ColumnOption,
+    strip_items: ColumnOption,
+    has_header: bool = True,
+    pipeline: Optional[Pipeline] = None,
+) -> Iterator[Tuple[Hashable, str]]:
+    """
+    Streams (normalized, original) key pairs of a table, duplicates included.
+
+    With one key column the normalized key is a string, as for plain lists;
+    with several it is a composite_key digest. ``case_sensitive`` and
+    ``strip_items`` may be given per key column; ``pipeline`` applies to
+    every key column.
+    """
+    field_rows = iter_key_fields(fp, fmt, key_columns, has_header)
+    if len(key_columns) == 1:
+        (case,) = _per_column(case_sensitive, 1)
+        (strip,) = _per_column(strip_items, 1)
+        return iter_norm_pairs((fields[0] for fields in field_rows), case, strip, pipeline)
+    normalize = key_normalizer(len(key_columns), case_sensitive, strip_items, pipeline)
+    return (pair for pair in map(normalize, field_rows) if pair is not None)
+
+
+def norm_map_from_table(
+    fp: BinaryIO,
+    fmt: str,
+    key_columns: Sequence[int],
+    case_sensitive: ColumnOption,
+    strip_items: ColumnOption,
+    has_header: bool = True,
+    pipeline: Optional[Pipeline] = None,
+) -> Dict[Hashable, str]:
+    """
+    Builds the norm map of a table's key column(s).
+    """
+    return norm_map_from_pairs(
+        iter_table_pairs(fp, fmt, key_columns, case_sensitive, strip_items, has_header, pipeline)
+    )
@@ -0,0 +1,123 @@
+"""
+Bulk splitting, trimming, case folding and deduplication with Arrow
+string kernels.
+
+For ASCII text, pyarrow.compute reproduces the pure-Python path exactly:
+the ASCII characters str.strip() and str.split() treat as whitespace are
+listed explicitly, and ascii_lower() equals str.casefold(). The whole
+text becomes one Arrow array, is split, trimmed and lowered in C++, and
+is deduplicated there too, so Python strings are created only for the
+distinct keys and their first-seen originals.
+
+Text that is not ASCII, or a non-empty normalization pipeline, stays on
+the Python path, and so does text shorter than VECTORIZE_MIN_CHARS: below
+that, importing pyarrow.compute and building the arrays costs more than
+the Python path saves. pyarrow is an optional dependency.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+from .columnar import pyarrow_available
+from .normalize import Pipeline
+
+
+# Around 70,000 short items; the Arrow path starts to win near a fifth of this.
+VECTORIZE_MIN_CHARS = 1 << 20
+
+# What str.isspace() accepts below 0x80.
+ASCII_WHITESPACE = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f "
+
+# Line boundaries of str.splitlines() below 0x80.
+_LINE_BREAK_PATTERN = "\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]"
+_WHITESPACE_PATTERN = "[\t\n\x0b\x0c\r\x1c-\x1f ]+"
+
+
+def can_vectorize(text: str, pipeline: Optional[Pipeline] = None) -> bool:
+    """
+    Whether the Arrow path gives the same result as the Python one and is
+    worth its start-up cost.
+    """
+    return (
+        len(text) >= VECTORIZE_MIN_CHARS
+        and not pipeline
+        and text.isascii()
+        and pyarrow_available()
+    )
+
+
+def _split(text: str, delim_mode: str, custom_delim: str):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # Parts whose key ends up empty are dropped later, so splits only need
+    # to agree with split_items() on the non-empty parts.
+    array = pa.array([text], pa.large_string())
+    if delim_mode in ("newline", "auto"):
+        if any(c in text for c in "\r\x0b\x0c\x1c\x1d\x1e"):
+            parts = pc.split_pattern_regex(array, _LINE_BREAK_PATTERN)
+        else:
+            parts = pc.split_pattern(array, "\n")
+        parts = parts.flatten()
+        # splitlines() yields no part after a trailing line break.
+        lines = len(parts) - (parts[-1].as_py() == "")
+        if delim_mode == "newline" or lines > 1:
+            return parts
+        return pc.split_pattern(array, ",").flatten()
+    if delim_mode == "whitespace":
+        # ascii_split_whitespace() does not count \x1c-\x1f as whitespace.
+        if any(c in text for c in "\x1c\x1d\x1e\x1f"):
+            return pc.split_pattern_regex(array, _WHITESPACE_PATTERN).flatten()
+        return pc.ascii_split_whitespace(array).flatten()
+    if delim_mode == "custom" and not custom_delim:
+        return array
+    delim = {"comma": ",", "semicolon": ";"}.get(delim_mode, custom_delim)
+    return pc.split_pattern(array, delim).flatten()
+
+
+def _normalize(text: str, delim_mode: str, custom_delim: str, case_sensitive: bool, strip_items: bool):
+    # (keys, items) arrays of the parts with a non-empty key.
+    import pyarrow.compute as pc
+
+    items = _split(text, delim_mode, custom_delim)
+    if strip_items:
+        items = pc.ascii_trim(items, ASCII_WHITESPACE)
+    items = items.filter(pc.not_equal(items, ""))
+    keys = items if case_sensitive else pc.ascii_lower(items)
+    return keys, items
+
+
+def vectorized_parse_norm_map(
+    text: str,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+) -> Dict[str, str]:
+    """
+    parse_norm_map for ASCII text without a pipeline (see can_vectorize).
+    """
+    import pyarrow.compute as pc
+
+    keys, items = _normalize(text, delim_mode, custom_delim, case_sensitive, strip_items)
+    # unique() keeps first-seen order and index_in() finds first occurrences.
+    distinct = pc.unique(keys)
+    if keys is items:
+        distinct = distinct.to_pylist()
+        return dict(zip(distinct, distinct))
+    first = pc.index_in(distinct, value_set=keys)
+    return dict(zip(distinct.to_pylist(), items.take(first).to_pylist()))
+
+
+def vectorized_parse_list(
+    text: str,
+    delim_mode: str,
+    custom_delim: str,
+    case_sensitive: bool,
+    strip_items: bool,
+) -> Tuple[List[str], Set[str]]:
+    """
+    parse_list for ASCII text without a pipeline (see can_vectorize).
+    """
+    import pyarrow.compute as pc
+
+    keys, items = _normalize(text, delim_mode, custom_delim, case_sensitive, strip_items)
+    return items.to_pylist(), set(pc.unique(keys).to_pylist())
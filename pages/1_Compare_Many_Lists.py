@@ -0,0 +1,183 @@
+import math
+from typing import List, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from listcompare import iter_file_pairs, iter_norm_pairs, split_items
+from listcompare.export import available_compressions, available_formats
+from listcompare.multi import MultiComparison, mask_members, region_label
+from ui_helpers import input_errors, make_download, normalization_settings, text_digest, upload_digest
+
+
+# -----------------------------
+# Cached Processing
+# -----------------------------
+# As on the two-list page, results are cached on a digest of every input
+# plus the parsing options; underscore-prefixed arguments are not hashed.
+CACHE_MAX_ENTRIES = 4
+CACHE_TTL = "1h"
+PAGE_SIZES = [100, 1_000, 10_000]
+MAX_PAGE_LISTS = 10
+
+
+def source_digest(text: str, uploaded) -> str:
+    return upload_digest(uploaded) if uploaded is not None else text_digest(text)
+
+
+def source_pairs(text: str, uploaded, options: Tuple):
+    delim_mode, custom_delim, case_sensitive, strip_items, pipeline = options
+    if uploaded is not None:
+        uploaded.seek(0)
+        return iter_file_pairs(
+            uploaded, delim_mode, custom_delim, case_sensitive, strip_items, pipeline=pipeline
+        )
+    return iter_norm_pairs(
+        split_items(text, delim_mode, custom_delim), case_sensitive, strip_items, pipeline
+    )
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_multi_comparison(digests: Tuple, options: Tuple, _sources: List) -> MultiComparison:
+    # One pass over all lists; no per-list sets are built.
+    return MultiComparison(source_pairs(text, uploaded, options) for text, uploaded in _sources)
+
+
+# -----------------------------
+# App Config
+# -----------------------------
+st.set_page_config(
+    page_title="List Comparator Pro",
+    page_icon="🔍",
+    layout="wide"
+)
+
+st.title("🔍 Compare Many Lists")
+
+
+# -----------------------------
+# Sidebar Settings
+# -----------------------------
+with st.sidebar:
+    st.header("⚙️ Settings")
+
+    num_lists = st.number_input("Number of lists", min_value=2, max_value=MAX_PAGE_LISTS, value=3)
+    input_source = st.radio("Input source", ["Paste text", "Upload files"], horizontal=True)
+
+    delim_mode = st.selectbox(
+        "Delimiter",
+        ["auto", "newline", "comma", "semicolon", "whitespace", "custom"]
+    )
+    custom_delim = st.text_input("Custom delimiter") if delim_mode == "custom" else ""
+
+    case_sensitive = st.checkbox("Case sensitive comparison", False)
+    strip_items = st.checkbox("Trim whitespace", True)
+    pipeline = normalization_settings()
+    sort_results = st.checkbox("Sort output alphabetically", False)
+
+
+# -----------------------------
+# Input Section
+# -----------------------------
+st.markdown("### 📥 Input Your Lists")
+
+labels = []
+sources = []
+for i, tab in enumerate(st.tabs([f"List {chr(65 + i)}" for i in range(num_lists)])):
+    with tab:
+        label = st.text_input("Label", f"List {chr(65 + i)}", key=f"multi_label_{i}")
+        if input_source == "Upload files":
+            uploaded = st.file_uploader(f"{label} file", key=f"multi_upload_{i}")
+            sources.append(("", uploaded))
+        else:
+            text = st.text_area(
+                f"{label} items", key=f"multi_text_{i}", height=200,
+                placeholder="Paste items here...",
+            )
+            sources.append((text, None))
+        labels.append(label)
+
+
+# -----------------------------
+# Processing logic
+# -----------------------------
+options = (delim_mode, custom_delim, case_sensitive, strip_items, pipeline)
+digests = tuple(source_digest(text, uploaded) for text, uploaded in sources)
+
+with st.spinner("Parsing lists..."), input_errors():
+    comparison = cached_multi_comparison(digests, options, sources)
+
+
+# -----------------------------
+# Results Section
+# -----------------------------
+st.divider()
+st.markdown("### 📊 Summary")
+
+size_cols = st.columns(min(num_lists, 5))
+for i, size in enumerate(comparison.sizes):
+    size_cols[i % len(size_cols)].metric(labels[i], size)
+
+all_lists = (1 << num_lists) - 1
+st.info(
+    f"**Distinct items overall:** {comparison.union_size:,} | "
+    f"**In every list:** {comparison.counts.get(all_lists, 0):,}"
+)
+
+# Every non-empty Venn region, largest first.
+masks = sorted(comparison.counts, key=lambda m: (-comparison.counts[m], m))
+regions = pd.DataFrame(
+    [
+        {**{labels[i]: bool(mask >> i & 1) for i in range(num_lists)}, "Items": comparison.counts[mask]}
+        for mask in masks
+    ],
+    columns=[*labels, "Items"],
+)
+st.dataframe(regions, use_container_width=True, hide_index=True)
+
+
+# -----------------------------
+# Explorer Section
+# -----------------------------
+st.markdown("### 🔍 Explorer")
+
+if not masks:
+    st.write("No items found.")
+    st.stop()
+
+mask = st.selectbox(
+    "Choose region to view:",
+    masks,
+    format_func=lambda m: f"{region_label(m, labels)} ({comparison.counts[m]:,})",
+)
+total = comparison.counts[mask]
+
+# Only the visible page is converted to a DataFrame and sent to the browser.
+p_col1, p_col2 = st.columns(2)
+with p_col1:
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+num_pages = max(1, math.ceil(total / page_size))
+with p_col2:
+    page_no = st.number_input(f"Page (of {num_pages:,})", min_value=1, max_value=num_pages, value=1)
+
+start = (page_no - 1) * page_size
+page_items = comparison.page(mask, start, start + page_size, sort_results)
+st.dataframe(pd.DataFrame({"Item": page_items}), use_container_width=True, hide_index=True)
+st.caption(f"Rows {start + 1:,}–{start + len(page_items):,} of {total:,}")
+
+compression = st.radio(
+    "Download compression",
+    available_compressions(),
+    horizontal=True,
+    help="TXT and CSV exports are compressed with streaming gzip/zstd; "
+         "Parquet and Arrow use their own encodings.",
+)
+
+name = "_".join(labels[i] for i in mask_members(mask)).replace(" ", "_")
+formats = available_formats()
+for d_col, fmt in zip(st.columns(len(formats)), formats):
+    with d_col:
+        make_download(
+            name, comparison, (digests, options), mask, fmt, sort_results, compression,
+            "multi_export",
+        )
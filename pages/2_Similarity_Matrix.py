@@ -0,0 +1,207 @@
+from typing import Tuple
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from listcompare.lsh import (
+    DEFAULT_THRESHOLD,
+    band_threshold,
+    choose_bands,
+    similar_pairs,
+    similarity_matrix,
+)
+from listcompare.sketches import DEFAULT_MINHASH_K, MinHash, jaccard_error_bound, minhash_from_file
+from ui_helpers import input_errors, normalization_settings, upload_digest
+
+
+# -----------------------------
+# Cached Processing
+# -----------------------------
+# One sketch per file, cached on the file's upload id plus the options, so
+# adding a file to the catalog only sketches the new one.
+CACHE_MAX_ENTRIES = 1_000
+CACHE_TTL = "1h"
+MAX_HEATMAP_LISTS = 60
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, show_spinner=False)
+def cached_minhash(digest: str, options: Tuple, k: int, _uploaded) -> MinHash:
+    delim_mode, custom_delim, case_sensitive, strip_items, pipeline = options
+    _uploaded.seek(0)
+    return minhash_from_file(
+        _uploaded, delim_mode, custom_delim, case_sensitive, strip_items, k, pipeline=pipeline
+    )
+
+
+def heatmap(matrix: pd.DataFrame) -> alt.Chart:
+    cells = (
+        matrix.rename_axis("List 1").reset_index()
+        .melt(id_vars="List 1", var_name="List 2", value_name="Jaccard")
+        .dropna()
+    )
+    order = list(matrix.index)
+    return alt.Chart(cells).mark_rect().encode(
+        x=alt.X("List 2:N", sort=order, title=None),
+        y=alt.Y("List 1:N", sort=order, title=None),
+        color=alt.Color("Jaccard:Q", scale=alt.Scale(domain=[0, 1], scheme="blues")),
+        tooltip=["List 1", "List 2", alt.Tooltip("Jaccard:Q", format=".1%")],
+    )
+
+
+# -----------------------------
+# App Config
+# -----------------------------
+st.set_page_config(
+    page_title="List Comparator Pro",
+    page_icon="🔍",
+    layout="wide"
+)
+
+st.title("🔍 Similarity Matrix")
+
+
+# -----------------------------
+# Sidebar Settings
+# -----------------------------
+with st.sidebar:
+    st.header("⚙️ Settings")
+
+    delim_mode = st.selectbox(
+        "Delimiter",
+        ["auto", "newline", "comma", "semicolon", "whitespace", "custom"]
+    )
+    custom_delim = st.text_input("Custom delimiter") if delim_mode == "custom" else ""
+
+    case_sensitive = st.checkbox("Case sensitive comparison", False)
+    strip_items = st.checkbox("Trim whitespace", True)
+    pipeline = normalization_settings()
+
+    st.divider()
+
+    minhash_k = st.select_slider(
+        "MinHash size (k)", [64, 128, 256, 512, 1024], DEFAULT_MINHASH_K,
+        help="Larger sketches give tighter estimates and sharper LSH bands.",
+    )
+    threshold = st.slider(
+        "Similarity threshold", 0.05, 1.0, DEFAULT_THRESHOLD, 0.05,
+        help="Pairs with estimated Jaccard similarity below this are not reported.",
+    )
+    bands, rows = choose_bands(minhash_k, threshold)
+    st.caption(
+        f"LSH: {bands} bands × {rows} rows; pairs become candidates from "
+        f"about {band_threshold(bands, rows):.0%} similarity."
+    )
+
+
+# -----------------------------
+# Input Section
+# -----------------------------
+st.markdown("### 📥 Upload Your Lists")
+
+uploads = st.file_uploader(
+    "List files (one list per file)",
+    accept_multiple_files=True,
+    help="gzip, bz2, xz and zstd files are decompressed on the fly.",
+)
+if len(uploads) < 2:
+    st.write("Upload at least two files.")
+    st.stop()
+
+# File names label the matrix, so repeated names get a suffix.
+names = []
+for u in uploads:
+    name, copy = u.name, 1
+    while name in names:
+        copy += 1
+        name = f"{u.name} ({copy})"
+    names.append(name)
+
+
+# -----------------------------
+# Processing logic
+# -----------------------------
+options = (delim_mode, custom_delim, case_sensitive, strip_items, pipeline)
+
+with st.spinner(f"Sketching {len(uploads):,} lists..."), input_errors():
+    sketches = [
+        cached_minhash(upload_digest(u), options, minhash_k, _uploaded=u)
+        for u in uploads
+    ]
+with st.spinner("Finding similar pairs..."):
+    pairs, num_candidates = similar_pairs(sketches, threshold, bands, rows)
+
+
+# -----------------------------
+# Results Section
+# -----------------------------
+st.divider()
+st.markdown("### 📊 Summary")
+
+n = len(uploads)
+m1, m2, m3 = st.columns(3)
+m1.metric("Lists", n)
+m2.metric("Pairs scored", num_candidates, help=f"Out of {n * (n - 1) // 2:,} possible pairs")
+m3.metric("Similar pairs", len(pairs))
+
+st.caption(
+    f"Jaccard estimates from MinHash (k={minhash_k}); a pair at {threshold:.0%} "
+    f"is accurate to about ±{jaccard_error_bound(threshold, minhash_k):.1%}."
+)
+
+if not pairs:
+    st.write("No pairs reach the similarity threshold.")
+    st.stop()
+
+pairs_df = pd.DataFrame(
+    [(names[i], names[j], estimate) for i, j, estimate in pairs],
+    columns=["List 1", "List 2", "Jaccard"],
+)
+st.dataframe(
+    pairs_df,
+    use_container_width=True,
+    hide_index=True,
+    column_config={"Jaccard": st.column_config.ProgressColumn(format="%.3f", min_value=0, max_value=1)},
+)
+
+matrix_df = pd.DataFrame(similarity_matrix(n, pairs), index=names, columns=names)
+
+d_col1, d_col2 = st.columns(2)
+with d_col1:
+    st.download_button(
+        "Download similar pairs (CSV)",
+        pairs_df.to_csv(index=False),
+        file_name="similar_pairs.csv",
+        mime="text/csv",
+        use_container_width=True,
+    )
+with d_col2:
+    st.download_button(
+        "Download similarity matrix (CSV)",
+        matrix_df.to_csv(),
+        file_name="similarity_matrix.csv",
+        mime="text/csv",
+        use_container_width=True,
+        help="Pairs below the threshold or never scored are left blank.",
+    )
+
+
+# -----------------------------
+# Heatmap Section
+# -----------------------------
+st.markdown("### 🗺️ Heatmap")
+
+# Limited to the lists in the most similar pairs, so the chart stays legible.
+shown = []
+for i, j, _ in pairs:
+    for idx in (i, j):
+        if idx not in shown and len(shown) < MAX_HEATMAP_LISTS:
+            shown.append(idx)
+shown_names = [names[i] for i in shown]
+if len(shown) < len({idx for i, j, _ in pairs for idx in (i, j)}):
+    st.caption(f"Showing the {MAX_HEATMAP_LISTS} lists involved in the most similar pairs.")
+
+st.altair_chart(
+    heatmap(matrix_df.loc[shown_names, shown_names]),
+    use_container_width=True,
+)
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from listcompare import ListComparison
+from listcompare.editdistance import BKTree, EditDistanceComparison, edit_distance_join, levenshtein
+
+
+def dp_levenshtein(a: str, b: str) -> int:
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[0], i
+        for j, cb in enumerate(b, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (ca != cb))
+    return row[-1]
+
+
+def random_strings(n: int, seed: int, max_len: int = 8):
+    rng = random.Random(seed)
+    return ["".join(rng.choices("abc", k=rng.randint(0, max_len))) for _ in range(n)]
+
+
+def test_levenshtein_matches_dp():
+    strings = random_strings(80, 0)
+    for a in strings:
+        for b in strings:
+            assert levenshtein(a, b) == dp_levenshtein(a, b), (a, b)
+
+
+def test_levenshtein_long_patterns():
+    # Patterns over 64 characters run on multi-word Python ints.
+    strings = random_strings(30, 1, max_len=200)
+    for a, b in zip(strings, strings[1:]):
+        assert levenshtein(a, b) == dp_levenshtein(a, b)
+    assert levenshtein("é" * 70 + "x", "é" * 70) == 1
+
+
+@pytest.mark.parametrize("max_distance", (0, 1, 2))
+def test_bktree_matches_brute_force(max_distance):
+    items = random_strings(300, 2)
+    tree = BKTree(items)
+    for text in random_strings(100, 3):
+        distances = [dp_levenshtein(text, item) for item in items]
+        expected = {(i, d) for i, d in enumerate(distances) if d <= max_distance}
+        assert set(tree.query(text, max_distance)) == expected, text
+        best = min(expected, key=lambda m: (m[1], m[0]), default=(-1, -1))
+        assert tree.best_match(text, max_distance) == best
+
+
+def test_join_and_comparison():
+    items_a, items_b = random_strings(100, 4), random_strings(100, 5)
+    for i, j, d in edit_distance_join(items_a, items_b, 1):
+        assert d == dp_levenshtein(items_a[i], items_b[j]) <= 1
+    with pytest.raises(ValueError):
+        edit_distance_join(items_a, items_b, -1)
+
+    base = ListComparison({s: s for s in items_a}, {s: s for s in items_b})
+    comparison = EditDistanceComparison(base, 1)
+    counts = comparison.counts
+    assert counts["A_only"] + counts["fuzzy"] == base.counts["A_only"]
+    assert counts["B_only"] + len({b for _, b, _ in comparison.matches}) == base.counts["B_only"]
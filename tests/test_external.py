@@ -0,0 +1,60 @@
+import random
+from io import BytesIO
+
+from listcompare import ExternalComparison, ListComparison
+from listcompare.engine import REGIONS
+from listcompare.external import iter_sorted_unique
+
+
+def test_sorted_unique_keeps_first_seen_across_runs(tmp_path):
+    rng = random.Random(0)
+    pairs = [(str(rng.randrange(500)), str(i)) for i in range(5_000)]
+    first = {}
+    for norm, raw in pairs:
+        first.setdefault(norm, raw)
+    assert list(iter_sorted_unique(pairs, str(tmp_path), run_size=37)) == sorted(first.items())
+
+
+def test_matches_in_memory_comparison(tmp_path):
+    rng = random.Random(1)
+    a = [f"Item-{rng.randrange(3_000)}" for _ in range(10_000)]
+    b = [f"item-{rng.randrange(3_000)}" for _ in range(10_000)]
+    external = ExternalComparison(
+        ((x.casefold(), x) for x in a), ((x.casefold(), x) for x in b),
+        out_dir=str(tmp_path), run_size=250,
+    )
+    memory = ListComparison.from_lists(a, b, False)
+    assert external.counts == memory.counts
+    for region in REGIONS:
+        assert sorted(external.iter_region(region)) == sorted(memory.iter_region(region))
+        # Sorted reads spill runs of 250 and are merged back in order.
+        for _ in range(2):
+            assert list(external.iter_region(region, sort=True)) == list(memory.iter_region(region, True))
+
+
+def test_items_with_line_breaks_round_trip():
+    external = ExternalComparison.from_files(BytesIO(b"x\ny,b"), BytesIO(b"b"), delim_mode="comma")
+    assert external.counts["A_only"] == 1
+    assert list(external.iter_region("A_only")) == ["x\ny"]
+
+
+def test_workers_match_serial(tmp_path):
+    rng = random.Random(2)
+    a = [f"Item-{rng.randrange(3_000)}" for _ in range(10_000)]
+    b = [f"item-{rng.randrange(3_000)}" for _ in range(10_000)]
+    serial = ExternalComparison(
+        ((x.casefold(), x) for x in a), ((x.casefold(), x) for x in b), run_size=250
+    )
+    parallel = ExternalComparison(
+        ((x.casefold(), x) for x in a), ((x.casefold(), x) for x in b),
+        out_dir=str(tmp_path), run_size=250, workers=3,
+    )
+    assert parallel.counts == serial.counts
+    for region in REGIONS:
+        # Partitions keep each key's first-seen original.
+        assert sorted(parallel.iter_region(region)) == sorted(serial.iter_region(region))
+        assert list(parallel.iter_region(region, sort=True)) == list(serial.iter_region(region, True))
+    # Only the region files and their sorted copies are left behind.
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"{region}{suffix}" for region in REGIONS for suffix in (".pkl", ".sorted.pkl")
+    )
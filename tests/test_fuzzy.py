@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from listcompare import ListComparison
+from listcompare.fuzzy import FuzzyComparison, TrigramIndex, fuzzy_join, trigram_similarity
+
+THRESHOLDS = (0.3, 0.5, 0.7, 0.8, 1.0)
+
+
+def random_items(n: int, seed: int):
+    # A small alphabet gives many near-duplicates at every threshold.
+    rng = random.Random(seed)
+    return ["".join(rng.choices("ab c", k=rng.randint(0, 10))) for _ in range(n)]
+
+
+def brute_force(items, text, threshold):
+    scores = ((i, trigram_similarity(text, item)) for i, item in enumerate(items))
+    return {i: score for i, score in scores if score >= threshold - 1e-9}
+
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_query_matches_all_pairs(threshold):
+    items = random_items(300, 0)
+    index = TrigramIndex(items, threshold)
+    # Queries include unseen grams, which the index ranks before all others.
+    for text in random_items(150, 1) + ["xyz", "a bx", "abcd"]:
+        matches = dict(index.query(text))
+        expected = brute_force(items, text, threshold)
+        assert matches.keys() == expected.keys(), text
+        for i, score in matches.items():
+            assert score == pytest.approx(expected[i])
+
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_join_picks_best_match(threshold):
+    items_a, items_b = random_items(200, 3), random_items(200, 4)
+    matches = {i: (j, score) for i, j, score in fuzzy_join(items_a, items_b, threshold)}
+    for i, text in enumerate(items_a):
+        expected = brute_force(items_b, text, threshold)
+        if not expected:
+            assert i not in matches
+            continue
+        best = max(expected.values())
+        j, score = matches[i]
+        assert score == pytest.approx(best)
+        assert j == min(k for k, s in expected.items() if s == pytest.approx(best))
+
+
+def test_comparison_counts():
+    map_a = {item: item.upper() for item in random_items(200, 5)}
+    map_b = {item: item for item in random_items(200, 6)}
+    base = ListComparison(map_a, map_b)
+    fuzzy = FuzzyComparison(base, 0.6)
+    counts = fuzzy.counts
+    assert counts["fuzzy"] == len(fuzzy.matches)
+    assert counts["intersection"] == base.counts["intersection"]
+    assert counts["A_only"] + counts["fuzzy"] == base.counts["A_only"]
+    assert len(list(fuzzy.iter_region("A_only"))) == counts["A_only"]
+    assert len(list(fuzzy.iter_region("B_only"))) == counts["B_only"]
+    assert len(fuzzy.page("fuzzy", 0, None)) == counts["fuzzy"]
@@ -0,0 +1,68 @@
+import random
+
+from listcompare import ListComparison
+from listcompare.index import IndexComparison, ReferenceIndex, write_index
+
+
+def random_norm_map(rng: random.Random, n: int):
+    # Mixed widths and non-ASCII, so byte order differs from str order.
+    alphabet = "abcé€😀\udc80"
+    return {
+        "".join(rng.choices(alphabet, k=rng.randint(0, 6))): f"{rng.choice(alphabet)}-{i}\nline"
+        for i in range(n)
+    }
+
+
+def test_round_trip(tmp_path):
+    rng = random.Random(0)
+    norm_map = random_norm_map(rng, 2_000)
+    path = str(tmp_path / "a.idx")
+    write_index(norm_map, path, {"delim_mode": "newline"})
+    with ReferenceIndex(path) as index:
+        assert len(index) == len(norm_map)
+        assert index.options == {"delim_mode": "newline"}
+        assert dict(index.items()) == norm_map
+        # Keys come back in UTF-8 byte order.
+        keys = list(index)
+        assert keys == sorted(norm_map, key=lambda k: k.encode("utf-8", "surrogatepass"))
+        for key, raw in norm_map.items():
+            assert key in index and index[key] == raw
+        assert index.get("missing-key") is None
+
+
+def test_binary_keys(tmp_path):
+    norm_map = {bytes([i]) * 16: str(i) for i in range(256)}
+    path = str(tmp_path / "b.idx")
+    write_index(norm_map, path)
+    with ReferenceIndex(path) as index:
+        assert index.binary_keys
+        assert dict(index.items()) == norm_map
+
+
+def test_comparison_matches_in_memory(tmp_path):
+    rng = random.Random(1)
+    map_a = random_norm_map(rng, 1_500)
+    map_b = random_norm_map(rng, 1_500)
+    path = str(tmp_path / "c.idx")
+    write_index(map_a, path)
+    with ReferenceIndex(path) as index:
+        indexed = IndexComparison(index, map_b)
+        memory = ListComparison(map_a, map_b)
+        assert indexed.counts == memory.counts
+        for region in ("A_only", "intersection", "B_only"):
+            assert sorted(indexed.iter_region(region)) == sorted(memory.iter_region(region))
+            assert list(indexed.iter_region(region, True)) == list(memory.iter_region(region, True))
+
+
+def test_version_1_files_still_sort(tmp_path):
+    norm_map = {"b": "Zed", "a": "apple", "c": "Mango"}
+    path = tmp_path / "v1.idx"
+    write_index(norm_map, str(path))
+    # Rewrite as LCINDEX1: same file without the order table.
+    data = path.read_bytes()
+    meta_end = 16 + int.from_bytes(data[8:16], "little")
+    table_end = meta_end + 8 * (2 * len(norm_map) + 1)
+    path.write_bytes(b"LCINDEX1" + data[8:table_end] + data[table_end + 8 * len(norm_map):])
+    with ReferenceIndex(str(path)) as index:
+        assert dict(index.items()) == norm_map
+        assert [raw for _, raw in index.items(sort=True)] == ["Mango", "Zed", "apple"]
@@ -0,0 +1,78 @@
+import re
+
+import pytest
+
+from listcompare import Pipeline, parse_norm_map
+from listcompare.normalize import compile_key, compile_keys, compile_normalizer
+
+
+@pytest.mark.parametrize(
+    "stage, item, key",
+    (
+        ("nfkc", "ﬁle①", "file1"),
+        ("strip_accents", "Crème Brûlée", "Creme Brulee"),
+        ("collapse_whitespace", " a \t b\n c ", "a b c"),
+        ("remove_punctuation", "a-b_c.d, e!", "abcd e"),
+        ("strip_leading_zeros", "007", "7"),
+        ("strip_leading_zeros", "000", "0"),
+        ("strip_leading_zeros", "0", "0"),
+        ("strip_leading_zeros", "0.50", "0.50"),
+        ("strip_leading_zeros", "007.5", "7.5"),
+        ("strip_leading_zeros", "A0042B", "A0042B"),
+        ("strip_leading_zeros", "SKU-007", "SKU-007"),
+        ("strip_leading_zeros", "2024-01-05", "2024-01-05"),
+        (("regex", r"\s+inc\.?$", ""), "Acme inc.", "Acme"),
+    ),
+)
+def test_stages(stage, item, key):
+    assert compile_key(True, Pipeline([stage]))(item) == key
+
+
+def test_stages_run_in_order_before_case_folding():
+    # Removing the dash leaves a double space for the next stage to collapse.
+    pipeline = Pipeline(["strip_accents", "remove_punctuation", "collapse_whitespace"])
+    assert compile_key(False, pipeline)("  Café - Noël ") == "cafe noel"
+    # A regex stage sees the output of earlier stages.
+    pipeline = Pipeline([("regex", "^0", "x"), "strip_leading_zeros"])
+    assert compile_key(True, pipeline)("007") == "x07"
+    pipeline = Pipeline(["strip_leading_zeros", ("regex", "^0", "x")])
+    assert compile_key(True, pipeline)("007") == "7"
+
+
+def test_regex_ignores_case_unless_case_sensitive():
+    pipeline = Pipeline([("regex", " inc$", "")])
+    assert compile_key(False, pipeline)("ACME INC") == "acme"
+    assert compile_key(True, pipeline)("ACME INC") == "ACME INC"
+    assert parse_norm_map("Acme Inc\nACME INC\nacme", "newline", "", False, True, pipeline) == {
+        "acme": "Acme Inc"
+    }
+
+
+def test_bulk_and_single_keys_agree():
+    pipeline = Pipeline(["nfkc", "strip_accents", "strip_leading_zeros", ("regex", "-", "")])
+    items = ["Élan-01", "0042", "ÉLAN-01", "x"]
+    for case_sensitive in (False, True):
+        key = compile_key(case_sensitive, pipeline)
+        assert list(compile_keys(case_sensitive, pipeline)(items)) == [key(i) for i in items]
+
+
+def test_normalizer_strips_and_drops_empty_keys():
+    normalize = compile_normalizer(False, True, Pipeline(["remove_punctuation"]))
+    assert list(normalize([" A.b ", "--", "", " c"])) == [("ab", "A.b"), ("c", "c")]
+    normalize = compile_normalizer(True, False)
+    assert list(normalize([" A ", ""])) == [(" A ", " A ")]
+
+
+@pytest.mark.parametrize(
+    "stages",
+    (["unknown"], [("regex", "(")], [("regex", "(", "")], [("nfkc", "x")], [()]),
+)
+def test_invalid_stages(stages):
+    with pytest.raises((ValueError, re.error)):
+        Pipeline(stages)
+
+
+def test_pipeline_is_hashable_and_json_shaped():
+    pipeline = Pipeline(["nfkc", ["regex", "a", "b"]])
+    assert pipeline == (("nfkc",), ("regex", "a", "b"))
+    assert hash(pipeline) == hash(Pipeline(["nfkc", ("regex", "a", "b")]))
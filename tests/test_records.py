@@ -0,0 +1,66 @@
+import io
+
+from listcompare import composite_key, norm_map_from_table, record_maps_from_table
+from listcompare.records import RecordComparison, payload_digest
+from listcompare.tabular import key_normalizer
+
+
+def compare(csv_a: str, csv_b: str, **options) -> RecordComparison:
+    maps = [
+        record_maps_from_table(io.BytesIO(text.encode()), "csv", [0], False, True, **options)
+        for text in (csv_a, csv_b)
+    ]
+    (norm_a, payloads_a), (norm_b, payloads_b) = maps
+    return RecordComparison(norm_a, norm_b, payloads_a, payloads_b)
+
+
+def test_changed_payload_lands_in_changed():
+    comparison = compare(
+        "id,name,qty\nA1,Widget,3\nB2,Gadget,5\nC3,Gizmo,1\n",
+        "id,name,qty\na1,Widget,3\nB2,Gadget,6\nD4,Doohickey,2\n",
+    )
+    assert comparison.counts == {"A_only": 1, "intersection": 2, "B_only": 1, "changed": 1}
+    assert comparison.changed == ["B2"]
+    assert list(comparison.iter_region("changed")) == ["B2"]
+    # Payloads are compared as they are, without case folding.
+    assert compare("id,name\nA1,Widget\n", "id,name\nA1,WIDGET\n").changed == ["A1"]
+
+
+def test_short_rows_match_padded_rows():
+    assert payload_digest(["x"]) == payload_digest(["x", "", ""])
+    assert payload_digest(["x", ""]) != payload_digest(["", "x"])
+    comparison = compare("id,a,b,c\nk1,x\nk2,x,,y\n", "id,a,b,c\nk1,x,,\nk2,x,y,\n")
+    assert comparison.changed == ["k2"]
+
+
+def test_quoted_and_multiline_fields():
+    csv_a = 'id,note\n"a,1","first\nline"\n"b ""q""",x\n'
+    csv_b = 'id,note\n"A,1","first\nline"\n"b ""q""",y\n'
+    norm_map = norm_map_from_table(io.BytesIO(csv_a.encode()), "csv", [0], False, True)
+    assert norm_map == {"a,1": "a,1", 'b "q"': 'b "q"'}
+    comparison = compare(csv_a, csv_b)
+    assert comparison.counts["intersection"] == 2
+    assert comparison.changed == ['b "q"']
+
+
+def test_composite_keys_are_length_prefixed():
+    assert composite_key(["a,b", "c"]) != composite_key(["a", "b,c"])
+    normalize = key_normalizer(2, False, True)
+    key, raw = normalize([" a,b ", "C"])
+    assert key == composite_key(["a,b", "c"])
+    assert raw == '"a,b",C'
+    assert normalize(["", " "]) is None
+
+
+def test_per_column_options_give_distinct_keys():
+    # Column 0 is case sensitive and untrimmed; column 1 is neither.
+    normalize = key_normalizer(2, (True, False), (False, True))
+    assert normalize(["A", " x "])[0] == normalize(["A", "X"])[0]
+    assert normalize(["A", "x"])[0] != normalize(["a", "x"])[0]
+    assert normalize(["A", "x"])[0] != normalize([" A", "x"])[0]
+
+
+def test_composite_key_table():
+    csv_a = "first,last,city\nAda,Lovelace,London\nada, lovelace ,Paris\nAlan,Turing,London\n"
+    norm_map = norm_map_from_table(io.BytesIO(csv_a.encode()), "csv", [0, 1], False, True)
+    assert list(norm_map.values()) == ["Ada,Lovelace", "Alan,Turing"]
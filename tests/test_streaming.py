@@ -0,0 +1,61 @@
+import bz2
+import gzip
+import io
+import lzma
+import random
+
+import pytest
+
+from listcompare import norm_map_from_file, parse_norm_map
+from listcompare.streaming import DECOMPRESSION_ERRORS, detect_compression
+
+COMPRESSORS = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+DELIM_MODES = ("auto", "newline", "comma", "semicolon", "whitespace", "custom")
+# Line breaks (including "\r\n" pairs), delimiters, a multi-byte character
+# and the letters of the custom delimiters below.
+ALPHABET = ("a", "b", "A", "é", " ", "\t", ",", ";", "|", "\n", "\r", "\r\n", "\x0b", "\u2028")
+
+
+def random_texts(n: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield "".join(rng.choices(ALPHABET, k=rng.randint(0, 25)))
+
+
+@pytest.mark.parametrize("delim_mode", DELIM_MODES)
+@pytest.mark.parametrize("strip_items", (False, True))
+def test_chunked_file_matches_text_parse(delim_mode, strip_items):
+    # Tiny chunks put every delimiter, "\r\n" pair and multi-character
+    # custom delimiter across a chunk boundary somewhere.
+    for seed, custom_delim in enumerate(("", "|", "ab", "aba", "\r\n")):
+        for text in random_texts(100, seed):
+            data = text.encode()
+            expected = parse_norm_map(text, delim_mode, custom_delim, False, strip_items, vectorize=False)
+            for chunk_size in range(1, 8):
+                result = norm_map_from_file(
+                    io.BytesIO(data), delim_mode, custom_delim, False, strip_items,
+                    chunk_size=chunk_size,
+                )
+                assert list(result.items()) == list(expected.items()), (text, custom_delim, chunk_size)
+
+
+@pytest.mark.parametrize("name", COMPRESSORS)
+@pytest.mark.parametrize("data, expected", ((b"", {}), (b"a\nB\nb", {"a": "a", "b": "B"})))
+def test_compressed_input(name, data, expected):
+    compressed = COMPRESSORS[name](data)
+    assert detect_compression(io.BytesIO(compressed))[0] == name
+    assert norm_map_from_file(io.BytesIO(compressed), "newline", "", False, True) == expected
+
+
+@pytest.mark.parametrize("text", (b"BZhang\nLi", b"BZh9\nBZh91AY", b"BZ"))
+def test_text_starting_with_bz2_letters_is_plain(text):
+    assert detect_compression(io.BytesIO(text))[0] is None
+    expected = {line.lower(): line for line in text.decode().splitlines()}
+    assert norm_map_from_file(io.BytesIO(text), "newline", "", False, True) == expected
+
+
+@pytest.mark.parametrize("name", COMPRESSORS)
+def test_truncated_input_raises_decompression_error(name):
+    compressed = COMPRESSORS[name](b"item\n" * 1000)
+    with pytest.raises(DECOMPRESSION_ERRORS):
+        norm_map_from_file(io.BytesIO(compressed[:len(compressed) // 2]), "newline", "", False, True)
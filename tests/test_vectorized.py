@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from listcompare import parse_list, parse_norm_map
+from listcompare.vectorized import (
+    VECTORIZE_MIN_CHARS,
+    can_vectorize,
+    vectorized_parse_list,
+    vectorized_parse_norm_map,
+)
+
+pytest.importorskip("pyarrow.compute")
+
+DELIM_MODES = ("auto", "newline", "comma", "semicolon", "whitespace", "custom")
+# Every ASCII character str.isspace() or str.splitlines() treats specially.
+ALPHABET = "aAbB ,;|-\n\r\t\x0b\x0c\x1c\x1d\x1e\x1f"
+# Without \r, \x0b-\x0c or \x1c-\x1f, splits take the plain-pattern kernels.
+COMMON_ALPHABET = "aAbB ,;|-\n\t"
+
+
+def random_texts(n: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(n):
+        alphabet = ALPHABET if i % 2 else COMMON_ALPHABET
+        yield "".join(rng.choices(alphabet, k=rng.randint(0, 30)))
+
+
+@pytest.mark.parametrize("delim_mode", DELIM_MODES)
+@pytest.mark.parametrize("case_sensitive", (False, True))
+@pytest.mark.parametrize("strip_items", (False, True))
+def test_arrow_path_matches_python_path(delim_mode, case_sensitive, strip_items):
+    for seed, custom_delim in enumerate(("", "|", "ab")):
+        for text in random_texts(200, seed):
+            args = (text, delim_mode, custom_delim, case_sensitive, strip_items)
+            expected = parse_norm_map(*args, vectorize=False)
+            # Same keys, same first-seen originals, same order.
+            assert list(vectorized_parse_norm_map(*args).items()) == list(expected.items()), args
+            assert vectorized_parse_list(*args) == parse_list(*args, vectorize=False), args
+
+
+def test_only_long_ascii_text_takes_the_arrow_path():
+    text = ("Item\n" * VECTORIZE_MIN_CHARS)[:VECTORIZE_MIN_CHARS]
+    assert can_vectorize(text)
+    assert not can_vectorize(text[:-1])
+    assert not can_vectorize(text + "é")
+    assert not can_vectorize(text, pipeline=("nfkc",))
+    args = (text, "newline", "", False, True)
+    assert parse_norm_map(*args) == parse_norm_map(*args, vectorize=False) == {"item": "Item", "i": "I"}
+
+
+def test_non_ascii_text_keeps_python_casefold():
+    text = "Straße\nSTRASSE\n" * VECTORIZE_MIN_CHARS
+    assert parse_norm_map(text, "newline", "", False, True) == {"strasse": "Straße"}
+
+
+def test_empty_text():
+    assert parse_norm_map(None, "newline", "", False, True) == {}
+    assert vectorized_parse_norm_map("", "newline", "", False, True) == {}
+    assert vectorized_parse_list("", "auto", "", False, True) == ([], set())
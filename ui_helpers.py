@@ -0,0 +1,273 @@
+"""
+Streamlit helpers shared by the app's pages: the normalization settings,
+server directories, cache digests of the inputs, input error reporting
+and the two-step region download.
+"""
+import hashlib
+import html
+import os
+import re
+import secrets
+import shutil
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import streamlit as st
+
+from listcompare.columnar import COLUMNAR_FORMATS
+from listcompare.export import export_suffix, export_to_tempfile
+from listcompare.normalize import Pipeline
+from listcompare.streaming import DECOMPRESSION_ERRORS
+
+
+# Prepared exports are served by Streamlit's static file server
+# (server.enableStaticServing) from <app dir>/static, at app/static/...
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+EXPORT_DIR = os.path.join(STATIC_DIR, "exports")
+EXPORT_MAX_AGE = 3600  # seconds before an abandoned export is swept
+try:
+    # The static server answers 404 for larger files.
+    from streamlit.web.server.app_static_file_handler import MAX_APP_STATIC_FILE_SIZE
+except ImportError:
+    MAX_APP_STATIC_FILE_SIZE = 200 * 1024 * 1024
+
+# Directories the app may read or write on the server, one environment
+# variable each. A feature that touches server files is off unless its
+# directory is set, and only opens files that resolve inside it.
+SERVER_DIR_VARIABLES = {
+    "data": "LISTCOMPARE_DATA_DIR",  # Server files input
+    "index": "LISTCOMPARE_INDEX_DIR",  # saved reference indexes
+    "bloom": "LISTCOMPARE_BLOOM_DIR",  # saved Bloom filters
+    "output": "LISTCOMPARE_OUTPUT_DIR",  # exports too large to download
+}
+# Saved files are picked by a bare name, never by path.
+_FILE_NAME = re.compile(r"\w[\w.-]*")
+FILE_NAME_HELP = "Names may contain letters, digits, \"_\", \"-\" and \".\"."
+
+NORMALIZATION_LABELS = {
+    "nfkc": "Unicode NFKC",
+    "strip_accents": "Strip accents",
+    "collapse_whitespace": "Collapse whitespace",
+    "remove_punctuation": "Remove punctuation",
+    "strip_leading_zeros": "Strip leading zeros",
+}
+
+
+# -----------------------------
+# Settings
+# -----------------------------
+def normalization_settings() -> Pipeline:
+    """
+    Sidebar expander building the key normalization pipeline, so every
+    page normalizes keys the same way.
+    """
+    with st.expander("Normalization"):
+        stages = [
+            name for name, title in NORMALIZATION_LABELS.items()
+            if st.checkbox(title, False, key=f"normalize_{name}")
+        ]
+        regex_pattern = st.text_input(
+            "Regex replace pattern",
+            help="Applied to keys after the stages above, ignoring case unless "
+                 "the comparison is case sensitive; case folding comes last.",
+        )
+        regex_replacement = st.text_input("Replacement", disabled=not regex_pattern)
+        if regex_pattern:
+            stages.append(("regex", regex_pattern, regex_replacement))
+        try:
+            return Pipeline(stages)
+        except re.error as e:
+            st.error(f"Invalid regex: {e}")
+            st.stop()
+
+
+# -----------------------------
+# Server directories
+# -----------------------------
+def server_dir(name: str) -> Optional[str]:
+    """
+    The configured directory for ``name``, resolved, or None if unset.
+    """
+    directory = os.environ.get(SERVER_DIR_VARIABLES[name])
+    return os.path.realpath(directory) if directory else None
+
+
+def resolve_in(directory: str, path: str) -> Optional[str]:
+    """
+    ``path``, taken relative to ``directory`` unless absolute, with ".."
+    and symlinks resolved; None if the result lies outside ``directory``.
+    """
+    resolved = os.path.realpath(os.path.join(directory, path))
+    return resolved if os.path.commonpath([directory, resolved]) == directory else None
+
+
+def named_file(directory: str, name: str, suffix: str) -> Optional[str]:
+    """
+    Path of ``name`` plus ``suffix`` inside ``directory``, or None unless
+    ``name`` is a bare file name.
+    """
+    if not _FILE_NAME.fullmatch(name):
+        return None
+    return resolve_in(directory, name + suffix)
+
+
+# -----------------------------
+# Cache digests
+# -----------------------------
+def text_digest(text: str) -> str:
+    return hashlib.blake2b(
+        (text or "").encode("utf-8", "surrogatepass"), digest_size=16
+    ).hexdigest()
+
+
+def upload_digest(uploaded, table: Optional[Tuple] = None) -> str:
+    if uploaded is None:
+        return "upload:none"
+    digest = f"upload:{uploaded.file_id}:{uploaded.size}"
+    return f"{digest}:{table}" if table else digest
+
+
+# -----------------------------
+# Input errors
+# -----------------------------
+@contextmanager
+def input_errors():
+    """
+    Stops the page with an error instead of a traceback when an input file
+    is corrupt or truncated compressed data.
+    """
+    try:
+        yield
+    except DECOMPRESSION_ERRORS as e:
+        st.error(f"Could not read an input file: {e}")
+        st.stop()
+
+
+# -----------------------------
+# Downloads
+# -----------------------------
+class PreparedExport:
+    """
+    An export file in its own unguessable directory under EXPORT_DIR. The
+    directory is removed by discard(), or when the object is garbage
+    collected with the session state that holds it. ``message`` replaces
+    the link when the file could not be served.
+    """
+
+    def __init__(self, request: Tuple, file_name: str):
+        self.request = request
+        self.file_name = file_name
+        self.message: Optional[str] = None
+        self.directory = os.path.join(EXPORT_DIR, secrets.token_urlsafe(16))
+        os.makedirs(self.directory)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, self.file_name)
+
+    @property
+    def url(self) -> str:
+        return f"app/static/exports/{os.path.basename(self.directory)}/{quote(self.file_name)}"
+
+    def discard(self):
+        self._finalizer()
+
+
+def sweep_exports(max_age: float = EXPORT_MAX_AGE):
+    # Catches exports whose session never released them, e.g. after a crash.
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(EXPORT_DIR):
+        if entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, True)
+
+
+def _oversized_export(prepared: PreparedExport, size: int, fmt: str, compression: str) -> str:
+    # Moves the file to the output directory if one is set, else drops it,
+    # and says which.
+    text = (
+        f"The export is {size / 2**20:,.0f} MB, more than the "
+        f"{MAX_APP_STATIC_FILE_SIZE / 2**20:,.0f} MB Streamlit serves as a download."
+    )
+    output_dir = server_dir("output")
+    if output_dir:
+        saved_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{prepared.file_name}"
+        shutil.move(prepared.path, os.path.join(output_dir, saved_name))
+        prepared.discard()
+        return f"{text} It was saved on the server as {saved_name} in the output directory."
+    prepared.discard()
+    if compression == "none" and fmt not in COLUMNAR_FORMATS:
+        text += " Try a download compression, or export a smaller region."
+    return f"{text} Set {SERVER_DIR_VARIABLES['output']} to save large exports on the server."
+
+
+def make_download(
+    name: str,
+    comparison,
+    comparison_key: Tuple,
+    region,
+    fmt: str,
+    sort: bool,
+    compression: str = "none",
+    state_prefix: str = "export",
+    label: str = "",
+):
+    """
+    Two-step download: the export is only generated when the user asks for
+    it, streamed in chunks (and compressed) to a file under the static
+    directory, and linked there. Reruns render only the link, so the file
+    is never read back into the app; Streamlit's static server streams it.
+    ``comparison_key`` is the comparison's cache key, so a prepared file is
+    only reused for the same inputs and options. Files over Streamlit's
+    static size limit are not linked; see _oversized_export().
+    ``state_prefix`` keeps each page's prepared exports apart; ``label`` is
+    shown on the buttons before the format.
+    """
+    state_key = f"{state_prefix}_{fmt}"
+    title = f"{label} ({fmt.upper()})" if label else fmt.upper()
+    request = (comparison_key, region, sort, compression)
+    prepared = st.session_state.get(state_key)
+    if prepared is not None and (
+        prepared.request != request
+        or (prepared.message is None and not os.path.exists(prepared.path))
+    ):
+        discard_export(state_key)
+        prepared = None
+
+    if prepared is None:
+        if not st.button(f"Prepare {title}", key=f"{state_key}_prepare", use_container_width=True):
+            return
+        sweep_exports()
+        file_name = re.sub(r"[^\w.-]", "_", f"{name}{export_suffix(fmt, compression)}")
+        prepared = PreparedExport(request, file_name)
+        with st.spinner(f"Writing {fmt.upper()} export..."):
+            path = export_to_tempfile(
+                comparison.iter_region(region, sort), fmt, compression, prepared.directory,
+                columns=comparison.region_columns(region),
+            )
+            os.replace(path, prepared.path)
+        size = os.path.getsize(prepared.path)
+        if size > MAX_APP_STATIC_FILE_SIZE:
+            prepared.message = _oversized_export(prepared, size, fmt, compression)
+        st.session_state[state_key] = prepared
+
+    if prepared.message:
+        st.warning(prepared.message)
+        return
+
+    st.markdown(
+        f'<a href="{html.escape(prepared.url)}" download="{html.escape(prepared.file_name)}">'
+        f"⬇️ Download {html.escape(title)}</a>",
+        unsafe_allow_html=True,
+    )
+
+
+def discard_export(state_key: str):
+    prepared = st.session_state.pop(state_key, None)
+    if prepared is not None:
+        prepared.discard()